@@ -1,11 +1,51 @@
 """ This module initializes the database. """
-from .db import Base, engine
-from sqlalchemy.orm import sessionmaker
+from typing import Any
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Bump whenever the models change, together with an Alembic revision that
+# stamps the new version, since ``init_db`` refuses any other version.
+SCHEMA_VERSION = 5
 
-def init_db():
+def __getattr__(name: str) -> Any:
+    """
+    Resolve ``SessionLocal`` on first access so that importing ``app`` does not
+    pull in SQLAlchemy.
+    """
+    if name == "SessionLocal":
+        from .db import SessionLocal
+        return SessionLocal
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def init_db(bind=None):
     """
     Initialize the database.
+
+    The schema version is kept in SQLite's ``user_version`` pragma. An empty
+    database gets the tables of ``SCHEMA_VERSION``, and a database already at
+    that version is left as it is, instead of running ``create_all`` on every
+    start. Tables are never dropped: a database at another version, or with
+    tables but no version, must be migrated with ``alembic upgrade head`` or
+    removed.
+
+    Args:
+        bind (Engine, optional): The engine to initialize. Defaults to the application engine.
+
+    Raises:
+        ValueError: If the database was created with another schema version.
     """
-    Base.metadata.create_all(bind=engine)
+    from sqlalchemy import inspect
+    from .db import Base, engine
+
+    with (bind or engine).begin() as connection:
+        version = connection.exec_driver_sql("PRAGMA user_version").scalar()
+        if version == SCHEMA_VERSION:
+            return
+
+        from . import models  # noqa: F401 - registers the tables on Base.metadata
+
+        if version != 0 or set(inspect(connection).get_table_names()) & set(Base.metadata.tables):
+            raise ValueError(
+                f"Database schema version {version} does not match {SCHEMA_VERSION}; "
+                "run 'alembic upgrade head' or remove the database"
+            )
+        Base.metadata.create_all(bind=connection)
+        connection.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
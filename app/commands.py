@@ -1,13 +1,57 @@
 """ Module for command classes. """
-from typing import Optional
-from app.services import StudentService
-from app.services import PresenceService
+from __future__ import annotations
+from typing import Callable, Optional, TYPE_CHECKING
 from datetime import time
 
+if TYPE_CHECKING:
+    from app.services import StudentService
+    from app.services import PresenceService
+
+class CommandParseError(ValueError):
+    """
+    Raised when an input line cannot be parsed into a command.
+
+    Attributes:
+        line_number (int): The 1-based number of the rejected line.
+        reason (str): The reason of the rejection, without the line number.
+        error_class (str): The rejection class of the line.
+    """
+    def __init__(self, line_number: int, message: str, error_class: str = "malformed_line"):
+        super().__init__(f"line {line_number}: {message}")
+        self.line_number = line_number
+        self.reason = message
+        self.error_class = error_class
+
+def parse_time(value: str) -> time:
+    """
+    Parse a ``HH:MM`` or ``HH:MM:SS`` token.
+
+    Args:
+        value (str): The token to parse.
+
+    Returns:
+        time: The parsed time.
+
+    Raises:
+        ValueError: If the token is not a valid time.
+    """
+    parts = value.split(":")
+    if len(parts) not in (2, 3) or not all(part.isdigit() for part in parts):
+        raise ValueError(f"invalid time {value!r}")
+    try:
+        return time(*map(int, parts))
+    except ValueError:
+        raise ValueError(f"invalid time {value!r}")
+
 class Command:
     """
     Abstract base class for commands.
+
+    Attributes:
+        grammar (tuple): One converter per argument, applied to the tokens of an input line.
     """
+    grammar: tuple = ()
+
     def execute(self, *args):
         """
         Execute the command.
@@ -24,6 +68,8 @@ class StudentCommand(Command):
     """
     Command for adding a student.
     """
+    grammar = (str,)
+
     def __init__(self, student_service: StudentService):
         """
         Initialize the StudentCommand.
@@ -46,6 +92,8 @@ class PresenceCommand(Command):
     """
     Command for recording student presence.
     """
+    grammar = (str, int, parse_time, parse_time, str)
+
     def __init__(self, presence_service: PresenceService):
         """
         Initialize the PresenceCommand.
@@ -55,18 +103,18 @@ class PresenceCommand(Command):
         """
         self.presence_service = presence_service
 
-    def execute(self, name: str, day: str, start_time: time, end_time: time, room: str) -> None:
+    def execute(self, name: str, day: int, start_time: time, end_time: time, room: str) -> None:
         """
         Execute the command to record student presence.
 
         Args:
             name (str): The name of the student.
-            day (str): The day of presence (will be converted to int).
-            start_time (str): The start time of presence.
-            end_time (str): The end time of presence.
+            day (int): The day of presence.
+            start_time (time): The start time of presence.
+            end_time (time): The end time of presence.
             room (str): The room where the student was present.
         """
-        self.presence_service.record_presence(name, int(day), start_time, end_time, room)
+        self.presence_service.record_presence(name, day, start_time, end_time, room)
 
 class CommandFactory:
     """
@@ -84,6 +132,7 @@ class CommandFactory:
             'Student': StudentCommand(student_service),
             'Presence': PresenceCommand(presence_service)
         }
+        self.parsers = {name: self._build_parser(name, command) for name, command in self.commands.items()}
 
     def get_command(self, command_name: str) -> Optional[Command]:
         """
@@ -96,3 +145,56 @@ class CommandFactory:
             Optional[Command]: The command object if found, None otherwise.
         """
         return self.commands.get(command_name)
+
+    def parse_line(self, line: str, line_number: int) -> Optional[tuple[Command, tuple]]:
+        """
+        Parse an input line into a command and its typed arguments.
+
+        Args:
+            line (str): The input line.
+            line_number (int): The 1-based number of the line, used in error messages.
+
+        Returns:
+            Optional[tuple[Command, tuple]]: The command and its arguments, or None for a blank line.
+
+        Raises:
+            CommandParseError: If the command is unknown or its arguments do not match its grammar.
+        """
+        parts = line.split()
+        if not parts:
+            return None
+        parser = self.parsers.get(parts[0])
+        if parser is None:
+            raise CommandParseError(line_number, f"unknown command {parts[0]!r}", "unknown_command")
+        return parser(parts, line_number)
+
+    @staticmethod
+    def _build_parser(name: str, command: Command) -> Callable[[list[str], int], tuple[Command, tuple]]:
+        """
+        Build the parser of a command from its grammar, once per factory.
+
+        Args:
+            name (str): The command name.
+            command (Command): The command object.
+
+        Returns:
+            Callable[[list[str], int], tuple[Command, tuple]]: A function turning the tokens of a
+            line into the command and its typed arguments.
+        """
+        expected = len(command.grammar) + 1
+        # Arguments declared as ``str`` are passed through untouched.
+        conversions = [(index, convert) for index, convert in enumerate(command.grammar, start=1) if convert is not str]
+
+        def parse(parts: list[str], line_number: int) -> tuple[Command, tuple]:
+            if len(parts) != expected:
+                raise CommandParseError(
+                    line_number, f"{name} expects {expected - 1} arguments, got {len(parts) - 1}"
+                )
+            try:
+                for index, convert in conversions:
+                    parts[index] = convert(parts[index])
+            except ValueError as err:
+                raise CommandParseError(line_number, str(err))
+            return command, tuple(parts[1:])
+
+        return parse
@@ -0,0 +1,175 @@
+""" Weekly attendance statistics built on per-student day bitmasks. """
+from array import array
+from collections import Counter
+from typing import Iterable, Optional
+
+DAYS_PER_WEEK = 7
+SCHOOL_DAYS_PER_WEEK = 5
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+def week_of(day: int) -> int:
+    """
+    Get the zero-based week index of a day number.
+
+    Args:
+        day (int): The day number, starting at 1 for the Monday of the first week.
+
+    Returns:
+        int: The week index.
+    """
+    return (day - 1) // DAYS_PER_WEEK
+
+def day_bit(day: int) -> int:
+    """
+    Get the weekday bit of a day number, bit 0 being Monday.
+
+    Args:
+        day (int): The day number, starting at 1 for the Monday of the first week.
+
+    Returns:
+        int: A mask with the single weekday bit set.
+    """
+    return 1 << ((day - 1) % DAYS_PER_WEEK)
+
+def popcount(mask: int) -> int:
+    """
+    Count the bits set in a mask.
+
+    Args:
+        mask (int): The mask.
+
+    Returns:
+        int: The number of set bits.
+    """
+    return bin(mask).count("1")
+
+class AttendanceHistogram:
+    """
+    Attendance of every student as one 7-bit weekday mask per week.
+
+    Masks are kept in one ``array('B')`` per week, aligned with ``names``, so the
+    statistics below are bitwise operations over compact arrays instead of set
+    construction per student.
+
+    Attributes:
+        names (list[str]): The student names, in storage order.
+        weeks (list[array]): One array of weekday masks per week.
+    """
+
+    def __init__(self, names: list[str], weeks: list[array]):
+        self.names = names
+        self.weeks = weeks
+
+    @classmethod
+    def from_attended_days(cls, rows: Iterable[tuple[str, Optional[int]]]) -> "AttendanceHistogram":
+        """
+        Build a multi-week histogram from attended day numbers.
+
+        Args:
+            rows (Iterable[tuple[str, Optional[int]]]): Tuples of (student_name, day) grouped by
+                student, with a day of None for students that attended no day.
+
+        Returns:
+            AttendanceHistogram: The histogram.
+        """
+        names = []
+        weeks = [array('B')]
+        previous = None
+        for name, day in rows:
+            if name != previous:
+                names.append(name)
+                for masks in weeks:
+                    masks.append(0)
+                previous = name
+            if day is None:
+                continue
+            week = week_of(day)
+            while len(weeks) <= week:
+                weeks.append(array('B', bytes(len(names))))
+            weeks[week][-1] |= day_bit(day)
+        return cls(names, weeks)
+
+    def weekday_distribution(self, week: Optional[int] = None) -> list[int]:
+        """
+        Count the students present on each weekday.
+
+        Args:
+            week (Optional[int]): The zero-based week to count, or None to add up every week.
+
+        Returns:
+            list[int]: Seven counts, Monday first.
+        """
+        mask_counts = Counter()
+        for masks in (self.weeks if week is None else [self.weeks[week]]):
+            mask_counts.update(masks)
+
+        distribution = [0] * DAYS_PER_WEEK
+        for mask, count in mask_counts.items():
+            for weekday in range(DAYS_PER_WEEK):
+                if mask >> weekday & 1:
+                    distribution[weekday] += count
+        return distribution
+
+    def weekday_students(self) -> list[int]:
+        """
+        Count the distinct students present on each weekday in any week.
+
+        Returns:
+            list[int]: Seven counts, Monday first.
+        """
+        folded = array('B', bytes(len(self.names)))
+        for masks in self.weeks:
+            for index, mask in enumerate(masks):
+                folded[index] |= mask
+        return AttendanceHistogram(self.names, [folded]).weekday_distribution()
+
+    def absent_on(self, days: Iterable[int]) -> list[str]:
+        """
+        List the students absent on all of the given days.
+
+        Args:
+            days (Iterable[int]): The day numbers, which may span several weeks.
+
+        Returns:
+            list[str]: The names of the students absent on every given day.
+        """
+        required = {}
+        for day in days:
+            required[week_of(day)] = required.get(week_of(day), 0) | day_bit(day)
+
+        present = array('B', bytes(len(self.names)))
+        for week, mask in required.items():
+            if week < len(self.weeks):
+                for index, week_mask in enumerate(self.weeks[week]):
+                    present[index] |= week_mask & mask
+        return [name for name, mask in zip(self.names, present) if not mask]
+
+    def attended_every_day(self, days_per_week: int = DAYS_PER_WEEK) -> list[str]:
+        """
+        List the students that attended every day of every week.
+
+        Args:
+            days_per_week (int): The number of days counted from Monday, e.g. 5 for a school week.
+
+        Returns:
+            list[str]: The names of the students with full attendance.
+        """
+        required = (1 << days_per_week) - 1
+        complete = array('B', [required]) * len(self.names)
+        for masks in self.weeks:
+            for index, mask in enumerate(masks):
+                complete[index] &= mask
+        return [name for name, mask in zip(self.names, complete) if mask & required == required]
+
+    def days_attended(self) -> list[int]:
+        """
+        Count the days each student attended across all weeks.
+
+        Returns:
+            list[int]: One count per student, aligned with ``names``.
+        """
+        totals = [0] * len(self.names)
+        for masks in self.weeks:
+            for index, mask in enumerate(masks):
+                totals[index] += popcount(mask)
+        return totals
@@ -1,5 +1,14 @@
 """ This module is used to configure the logger for the application. """
 import logging
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """
+    Configure the root logger. Called once by the CLI entry point rather than
+    at import time.
+
+    Args:
+        level (int): The logging level to use.
+    """
+    logging.basicConfig(level=level, format='%(asctime)s - %(levelname)s - %(message)s')
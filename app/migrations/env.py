@@ -6,6 +6,7 @@ from sqlalchemy import pool
 from alembic import context
 
 from app.db import Base
+from app import models  # noqa: F401 - registers the tables on Base.metadata
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -2,13 +2,32 @@
 from __future__ import annotations
 import datetime
 from typing import Any, List
-from sqlalchemy import Integer, String, ForeignKey, Time
+from sqlalchemy import Index, Integer, String, ForeignKey, Time
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from .db import Base
 from .schemas import PresenceSchema, StudentSchema
+from .histogram import week_of
 from marshmallow.exceptions import ValidationError
 
 
+class InvalidDataError(ValueError):
+    """
+    Raised when a factory receives data that does not pass its schema.
+
+    Attributes:
+        messages (dict): The validation messages, keyed by field name.
+    """
+    def __init__(self, messages: dict):
+        super().__init__(f"Invalid data: {messages}")
+        self.messages = messages
+
+    @property
+    def error_class(self) -> str:
+        """The rejection class of the first invalid field."""
+        field = next(iter(self.messages), None)
+        return {"day": "invalid_day", "end_time": "end_before_start"}.get(field, "invalid_data")
+
+
 class Student(Base):
     __tablename__ = 'students'
 
@@ -20,10 +39,14 @@ class Student(Base):
 
 class Presence(Base):
     __tablename__ = 'presences'
+    # Presences are partitioned by week: date range queries only walk the index
+    # entries of the weeks they cover, and old weeks can be archived separately.
+    __table_args__ = (Index("ix_presences_student_week", "student_id", "week"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     student_id: Mapped[int] = mapped_column(ForeignKey("students.id"))
     day: Mapped[int] = mapped_column(Integer)
+    week: Mapped[int] = mapped_column(Integer)
     start_time: Mapped[datetime.time] = mapped_column(Time)
     end_time: Mapped[datetime.time] = mapped_column(Time)
     room: Mapped[str] = mapped_column(String)
@@ -31,6 +54,14 @@ class Presence(Base):
     student: Mapped[Student] = relationship("Student", back_populates="presences")
 
 
+class Archive(Base):
+    __tablename__ = 'archives'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    path: Mapped[str] = mapped_column(String)
+    before_week: Mapped[int] = mapped_column(Integer)
+
+
 def presence_factory(**kwargs: Any) -> Presence:
     """"
     Factory function for creating a Presence object.
@@ -45,9 +76,9 @@ def presence_factory(**kwargs: Any) -> Presence:
     try:
         validated_data = schema.load(kwargs)
     except ValidationError as err:
-        raise ValueError(f"Invalid data: {err.messages}")
+        raise InvalidDataError(err.messages)
 
-    presence = Presence(**validated_data)
+    presence = Presence(**validated_data, week=week_of(validated_data["day"]))
     return presence
 
 def student_factory(**kwargs: Any) -> Student:
@@ -64,7 +95,7 @@ def student_factory(**kwargs: Any) -> Student:
     try:
         validated_data = schema.load(kwargs)
     except ValidationError as err:
-        raise ValueError(f"Invalid data: {err.messages}")
+        raise InvalidDataError(err.messages)
 
     student = Student(**validated_data)
     return student
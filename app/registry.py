@@ -0,0 +1,67 @@
+""" In-memory registry of the known students. """
+import sys
+from typing import Callable, Iterable, Optional
+
+class StudentRegistry:
+    """
+    Map of interned student names to student IDs.
+
+    The registry is loaded from the database on first use and shared by the
+    services, so duplicate registrations are rejected and presence lines are
+    resolved without a query. Names are interned, so every line referring to
+    a student shares a single string.
+
+    Attributes:
+        ids (dict[str, int]): The student ID of every known name.
+    """
+
+    def __init__(self):
+        self.ids: dict[str, int] = {}
+        self._loaded = False
+
+    def load(self, rows: Callable[[], Iterable[tuple[int, str]]]) -> None:
+        """
+        Load the known students, once.
+
+        Args:
+            rows (Callable[[], Iterable[tuple[int, str]]]): A function returning (student_id, name)
+                tuples, only called the first time.
+        """
+        if self._loaded:
+            return
+        for student_id, name in rows():
+            self.ids[sys.intern(name)] = student_id
+        self._loaded = True
+
+    def add(self, name: str, student_id: int) -> str:
+        """
+        Register a student.
+
+        Args:
+            name (str): The name of the student.
+            student_id (int): The ID of the student.
+
+        Returns:
+            str: The interned name.
+        """
+        name = sys.intern(name)
+        self.ids[name] = student_id
+        return name
+
+    def get_id(self, name: str) -> Optional[int]:
+        """
+        Get the ID of a student by name.
+
+        Args:
+            name (str): The name of the student.
+
+        Returns:
+            Optional[int]: The student ID if known, None otherwise.
+        """
+        return self.ids.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.ids
+
+    def __len__(self) -> int:
+        return len(self.ids)
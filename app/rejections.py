@@ -0,0 +1,123 @@
+""" Module for recording rejected input lines. """
+import csv
+import queue
+import threading
+from collections import Counter
+from typing import Optional, TextIO
+
+# The number of rejections buffered for the writer before the ingest loop waits for it.
+QUEUE_SIZE = 10_000
+
+def classify_error(error: Exception) -> str:
+    """
+    Get the rejection class of an error.
+
+    Args:
+        error (Exception): The error raised while processing a line.
+
+    Returns:
+        str: The ``error_class`` of the error if it has one, its type name otherwise.
+    """
+    return getattr(error, "error_class", None) or type(error).__name__
+
+class RejectionLog:
+    """
+    Sidecar file of rejected input lines, with counts per error class.
+
+    Rejections are handed to a background thread through a bounded queue and
+    written as tab separated ``line_number, error_class, reason, line`` rows,
+    so the cost for the ingest loop does not depend on the error rate. The
+    file is only created, or truncated, on the first rejection, so a clean run
+    never writes next to its input.
+
+    Attributes:
+        path (str): The path of the sidecar file.
+        counts (Counter): The number of rejected lines per error class.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.counts = Counter()
+        self._queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self._writer: Optional[threading.Thread] = None
+        self._error: Optional[Exception] = None
+
+    def __enter__(self) -> "RejectionLog":
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        # A write failure must not hide the error the with block is already raising.
+        error = self._finish()
+        if error is not None and exc_type is None:
+            raise error
+
+    def open(self) -> None:
+        """
+        Create or truncate the sidecar file and start the writer thread.
+
+        Raises:
+            OSError: If the sidecar file cannot be opened.
+        """
+        if self._writer is not None:
+            return
+        file = open(self.path, "w", newline="")
+        self._error = None
+        self._writer = threading.Thread(target=self._write_rows, args=(file,), name="rejection-writer", daemon=True)
+        self._writer.start()
+
+    def reject(self, line_number: int, line: str, error: Exception) -> None:
+        """
+        Record a rejected line.
+
+        Args:
+            line_number (int): The 1-based number of the line.
+            line (str): The raw line.
+            error (Exception): The error that caused the rejection.
+
+        Raises:
+            OSError: If the sidecar file cannot be created on the first rejection.
+        """
+        self.open()
+        error_class = classify_error(error)
+        self.counts[error_class] += 1
+        reason = getattr(error, "reason", None) or str(error)
+        self._queue.put((line_number, error_class, reason, line.rstrip("\n")))
+
+    @property
+    def total(self) -> int:
+        """The number of rejected lines."""
+        return sum(self.counts.values())
+
+    def close(self) -> None:
+        """
+        Flush the pending rejections and wait for the writer to finish.
+
+        Raises:
+            OSError: If the writer failed to write the sidecar file.
+        """
+        error = self._finish()
+        if error is not None:
+            raise error
+
+    def _finish(self) -> Optional[Exception]:
+        if self._writer is None:
+            return None
+        self._queue.put(None)
+        self._writer.join()
+        self._writer = None
+        return self._error
+
+    def _write_rows(self, file: TextIO) -> None:
+        with file:
+            writer = csv.writer(file, delimiter="\t", lineterminator="\n")
+            while True:
+                row = self._queue.get()
+                if row is None:
+                    return
+                if self._error is not None:
+                    # Keep draining so that the ingest loop never blocks on a full queue.
+                    continue
+                try:
+                    writer.writerow(row)
+                except OSError as err:
+                    self._error = err
@@ -0,0 +1,151 @@
+""" Module for report writer classes. """
+import csv
+import io
+import json
+from typing import Iterable, Optional, TextIO
+
+class ReportWriter:
+    """
+    Abstract base class for report writers.
+
+    Entries are formatted lazily and written to the stream in chunks, so a
+    report costs one ``write`` call per ``chunk_size`` entries and never has to
+    be held in memory as a whole.
+    """
+    def __init__(self, stream: TextIO, chunk_size: int = 1000):
+        """
+        Initialize the ReportWriter.
+
+        Args:
+            stream (TextIO): The stream the report is written to.
+            chunk_size (int): The number of formatted entries buffered before each write.
+        """
+        self.stream = stream
+        self.chunk_size = chunk_size
+
+    def header(self) -> str:
+        """
+        Return the text written before the first entry.
+
+        Returns:
+            str: The header, empty by default.
+        """
+        return ""
+
+    def format_entry(self, entry: tuple) -> str:
+        """
+        Format a single report entry as one line.
+
+        Args:
+            entry (tuple): A tuple containing (student_name, total_minutes, days_attended).
+
+        Raises:
+            NotImplementedError: If the subclass does not implement this method.
+        """
+        raise NotImplementedError
+
+    def write(self, entries: Iterable[tuple]) -> int:
+        """
+        Write the report entries to the stream.
+
+        Args:
+            entries (Iterable[tuple]): The report entries, consumed lazily.
+
+        Returns:
+            int: The number of entries written.
+        """
+        header = self.header()
+        buffer = [header] if header else []
+        count = 0
+        for entry in entries:
+            buffer.append(self.format_entry(entry))
+            count += 1
+            if len(buffer) >= self.chunk_size:
+                self.stream.write("".join(buffer))
+                buffer.clear()
+        if buffer:
+            self.stream.write("".join(buffer))
+        self.stream.flush()
+        return count
+
+class TextReportWriter(ReportWriter):
+    """
+    Writer for the human readable report, e.g. ``Marco: 142 minutes in 2 days``.
+    """
+    @staticmethod
+    def format_text(entry: tuple) -> str:
+        """
+        Format a single report entry without a line terminator.
+
+        Args:
+            entry (tuple): A tuple containing (student_name, total_minutes, days_attended).
+
+        Returns:
+            str: A formatted string representing the report entry.
+        """
+        student_name, total_minutes, days = entry
+        day_str = "day" if days == 1 else "days"
+        time_str = f"{total_minutes} minutes"
+        days_str = f" in {days} {day_str}" if days > 0 else ""
+        return f"{student_name}: {time_str}{days_str}"
+
+    def format_entry(self, entry: tuple) -> str:
+        return self.format_text(entry) + "\n"
+
+class JsonLinesReportWriter(ReportWriter):
+    """
+    Writer for the JSON Lines report, one object per student.
+    """
+    def format_entry(self, entry: tuple) -> str:
+        student_name, total_minutes, days = entry
+        return json.dumps({"name": student_name, "minutes": total_minutes, "days": days}) + "\n"
+
+class CsvReportWriter(ReportWriter):
+    """
+    Writer for the CSV report, with a ``name,minutes,days`` header row.
+    """
+    def __init__(self, stream: TextIO, chunk_size: int = 1000):
+        super().__init__(stream, chunk_size)
+        self._line = io.StringIO()
+        self._csv = csv.writer(self._line, lineterminator="\n")
+
+    def _format_row(self, row: Iterable) -> str:
+        self._line.seek(0)
+        self._line.truncate()
+        self._csv.writerow(row)
+        return self._line.getvalue()
+
+    def header(self) -> str:
+        return self._format_row(("name", "minutes", "days"))
+
+    def format_entry(self, entry: tuple) -> str:
+        return self._format_row(entry)
+
+class ReportWriterFactory:
+    """
+    Factory class for creating report writer objects.
+    """
+    def __init__(self, stream: TextIO):
+        """
+        Initialize the ReportWriterFactory.
+
+        Args:
+            stream (TextIO): The stream the reports are written to.
+        """
+        self.writers = {
+            'text': TextReportWriter(stream),
+            'jsonl': JsonLinesReportWriter(stream),
+            'csv': CsvReportWriter(stream)
+        }
+
+    def get_writer(self, report_format: str) -> Optional[ReportWriter]:
+        """
+        Get a report writer based on the format name.
+
+        Args:
+            report_format (str): The name of the output format.
+
+        Returns:
+            Optional[ReportWriter]: The writer if found, None otherwise.
+        """
+        return self.writers.get(report_format)
@@ -1,7 +1,51 @@
 """ This module contains the repositories for the Student and Presence models. """
-from .models import Student, Presence
+import datetime
+from . import SCHEMA_VERSION
+from .db import Base
+from .histogram import week_of
+from .models import Archive, Student, Presence
+from sqlalchemy import Integer, and_, case, cast, create_engine, distinct, func, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Iterator, Optional
+
+def _minutes_of_day(column):
+    """
+    Build a SQL expression converting a stored time into minutes since midnight.
+    """
+    return cast(func.strftime('%H', column), Integer) * 60 + cast(func.strftime('%M', column), Integer)
+
+def _duration_minutes():
+    """
+    Build a SQL expression for the duration of a presence in minutes.
+    """
+    return _minutes_of_day(Presence.end_time) - _minutes_of_day(Presence.start_time)
+
+def _day_range_conditions(first_day: Optional[int], last_day: Optional[int]) -> list:
+    """
+    Build the conditions selecting the presences of a day range, by week first so the
+    (student, week) index is used.
+    """
+    conditions = []
+    if first_day is not None:
+        conditions += [Presence.week >= week_of(first_day), Presence.day >= first_day]
+    if last_day is not None:
+        conditions += [Presence.week <= week_of(last_day), Presence.day <= last_day]
+    return conditions
+
+def _init_archive(archive_engine) -> None:
+    """
+    Create the schema of an archive database, which is never dropped.
+
+    Raises:
+        ValueError: If the archive was created with another schema version.
+    """
+    with archive_engine.begin() as connection:
+        version = connection.exec_driver_sql("PRAGMA user_version").scalar()
+        if version not in (0, SCHEMA_VERSION):
+            raise ValueError(f"Archive schema version {version} does not match {SCHEMA_VERSION}")
+        Base.metadata.create_all(bind=connection)
+        connection.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
 
 class StudentRepository:
     """
@@ -37,9 +81,17 @@ class StudentRepository:
 
         Returns:
             Student: The created Student object with updated database information.
+
+        Raises:
+            IntegrityError: If a student with the same name exists. The session is rolled back,
+                so it stays usable for the next operations.
         """
         self.db.add(student)
-        self.db.commit()
+        try:
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
+            raise
         self.db.refresh(student)
         return student
 
@@ -52,6 +104,20 @@ class StudentRepository:
         """
         return self.db.query(Student).all()
 
+    def iter_names(self, batch_size: int = 1000) -> Iterator[tuple[int, str]]:
+        """
+        Stream the ID and name of every student without loading ORM objects.
+
+        Args:
+            batch_size (int): The number of rows fetched per round trip.
+
+        Returns:
+            Iterator[tuple[int, str]]: Tuples of (student_id, student_name), in ID order.
+        """
+        statement = select(Student.id, Student.name).order_by(Student.id).execution_options(yield_per=batch_size)
+        for student_id, name in self.db.execute(statement):
+            yield (student_id, name)
+
 class PresenceRepository:
     """
     Repository for managing Presence entities in the database.
@@ -91,3 +157,174 @@ class PresenceRepository:
             list[Presence]: A list of Presence objects associated with the given student ID.
         """
         return self.db.query(Presence).filter(Presence.student_id == student_id).all()
+
+    def iter_ordered_by_student(
+        self, batch_size: int = 1000, first_day: Optional[int] = None, last_day: Optional[int] = None
+    ) -> Iterator[tuple[int, int, datetime.time, datetime.time]]:
+        """
+        Stream the presence records as plain rows, ordered by student ID.
+
+        Args:
+            batch_size (int): The number of rows fetched per round trip.
+            first_day (Optional[int]): The first day to include, or None for no lower bound.
+            last_day (Optional[int]): The last day to include, or None for no upper bound.
+
+        Returns:
+            Iterator[tuple[int, int, datetime.time, datetime.time]]: Tuples of
+            (student_id, day, start_time, end_time).
+        """
+        statement = (
+            select(Presence.student_id, Presence.day, Presence.start_time, Presence.end_time)
+            .where(*_day_range_conditions(first_day, last_day))
+            .order_by(Presence.student_id)
+            .execution_options(yield_per=batch_size)
+        )
+        for student_id, day, start_time, end_time in self.db.execute(statement):
+            yield (student_id, day, start_time, end_time)
+
+    def iter_all(self, batch_size: int = 1000) -> Iterator[tuple[int, int, datetime.time, datetime.time, str]]:
+        """
+        Stream every presence record as a plain row.
+
+        Args:
+            batch_size (int): The number of rows fetched per round trip.
+
+        Returns:
+            Iterator[tuple[int, int, datetime.time, datetime.time, str]]: Tuples of
+            (student_id, day, start_time, end_time, room), in ID order.
+        """
+        statement = (
+            select(Presence.student_id, Presence.day, Presence.start_time, Presence.end_time, Presence.room)
+            .order_by(Presence.id)
+            .execution_options(yield_per=batch_size)
+        )
+        for student_id, day, start_time, end_time, room in self.db.execute(statement):
+            yield (student_id, day, start_time, end_time, room)
+
+    def iter_report_rows(
+        self,
+        min_minutes: int,
+        batch_size: int = 1000,
+        first_day: Optional[int] = None,
+        last_day: Optional[int] = None,
+    ) -> Iterator[tuple[str, int, int]]:
+        """
+        Stream the per-student attendance totals, aggregated and sorted by the database.
+
+        Rows are fetched from the cursor ``batch_size`` at a time, so memory use does
+        not depend on the number of students. When a day range is given, presences are
+        looked up by (student, week) so only the weeks in the range are read.
+
+        Args:
+            min_minutes (int): The minimum duration for a presence to be counted.
+            batch_size (int): The number of rows fetched per round trip.
+            first_day (Optional[int]): The first day to include, or None for no lower bound.
+            last_day (Optional[int]): The last day to include, or None for no upper bound.
+
+        Returns:
+            Iterator[tuple[str, int, int]]: Tuples of (student_name, total_minutes, days_attended),
+            sorted by total minutes in descending order.
+        """
+        duration = _duration_minutes()
+        valid = duration >= min_minutes
+        total_minutes = func.coalesce(func.sum(case((valid, duration))), 0)
+        days_attended = func.count(distinct(case((valid, Presence.day))))
+        join_condition = [Presence.student_id == Student.id, *_day_range_conditions(first_day, last_day)]
+        statement = (
+            select(Student.name, total_minutes, days_attended)
+            .outerjoin(Presence, and_(*join_condition))
+            .group_by(Student.id)
+            .order_by(total_minutes.desc(), Student.id)
+            .execution_options(yield_per=batch_size)
+        )
+        for name, minutes, days in self.db.execute(statement):
+            yield (name, minutes, days)
+
+    def iter_attended_days(self, min_minutes: int, batch_size: int = 1000) -> Iterator[tuple[str, Optional[int]]]:
+        """
+        Stream the distinct days attended by every student.
+
+        Args:
+            min_minutes (int): The minimum duration for a presence to be counted.
+            batch_size (int): The number of rows fetched per round trip.
+
+        Returns:
+            Iterator[tuple[str, Optional[int]]]: Tuples of (student_name, day) grouped by student in
+            ID order, with a day of None for students that attended no day.
+        """
+        statement = (
+            select(Student.name, Presence.day)
+            .outerjoin(Presence, and_(Presence.student_id == Student.id, _duration_minutes() >= min_minutes))
+            .distinct()
+            .order_by(Student.id, Presence.day)
+            .execution_options(yield_per=batch_size)
+        )
+        for name, day in self.db.execute(statement):
+            yield (name, day)
+
+    def get_latest_archive(self) -> Optional[Archive]:
+        """
+        Retrieve the archive with the latest cutoff week.
+
+        Returns:
+            Optional[Archive]: The archive record if weeks were archived, None otherwise.
+        """
+        return self.db.query(Archive).order_by(Archive.before_week.desc()).first()
+
+    def archive_weeks(self, before_week: int, archive_path: str) -> int:
+        """
+        Move the presences of every week before ``before_week`` to an archive database.
+
+        The archive is a SQLite file with the same schema as the live database, attached
+        for the copy, so archived weeks can be reported by binding a session to it while
+        queries on the current weeks keep working on a small table. The cutoff is recorded
+        in the live database so that reports can refuse ranges it no longer holds.
+
+        Args:
+            before_week (int): The first week index to keep in the live database.
+            archive_path (str): The path of the archive SQLite file, created if missing.
+
+        Returns:
+            int: The number of presence records moved to the archive.
+
+        Raises:
+            ValueError: If the archive was created with another schema version.
+        """
+        archive_engine = create_engine(f"sqlite:///{archive_path}")
+        try:
+            _init_archive(archive_engine)
+        finally:
+            archive_engine.dispose()
+
+        self.db.commit()
+        connection = self.db.connection()
+        connection.exec_driver_sql("ATTACH DATABASE ? AS archive", (archive_path,))
+        try:
+            # The archive has its own key space: students are matched by name and
+            # presences get new IDs, since live IDs are reused after truncation.
+            connection.exec_driver_sql(
+                "INSERT INTO archive.students (name) "
+                "SELECT name FROM main.students WHERE true "
+                "ON CONFLICT (name) DO NOTHING"
+            )
+            moved = connection.exec_driver_sql(
+                "INSERT INTO archive.presences (student_id, day, week, start_time, end_time, room) "
+                "SELECT archived.id, presence.day, presence.week, presence.start_time, presence.end_time, presence.room "
+                "FROM main.presences AS presence "
+                "JOIN main.students AS student ON student.id = presence.student_id "
+                "JOIN archive.students AS archived ON archived.name = student.name "
+                "WHERE presence.week < ?",
+                (before_week,),
+            ).rowcount
+            connection.exec_driver_sql(
+                "DELETE FROM main.presences WHERE week < ? AND student_id IN (SELECT id FROM main.students)",
+                (before_week,),
+            )
+            self.db.add(Archive(path=archive_path, before_week=before_week))
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        finally:
+            self.db.connection().exec_driver_sql("DETACH DATABASE archive")
+        return moved
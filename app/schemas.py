@@ -1,6 +1,17 @@
 """ Marshmallow schemas for the Student and Presence models. """
+import datetime
 from marshmallow import Schema, fields, validate, validates_schema, ValidationError
 
+# The last valid day number, a year of days. Anything larger is most likely a typo, such as a date.
+MAX_DAY = 366
+
+class TimeField(fields.Time):
+    """Time field that also accepts already parsed ``datetime.time`` values."""
+    def _deserialize(self, value, attr, data, **kwargs):
+        if isinstance(value, datetime.time):
+            return value
+        return super()._deserialize(value, attr, data, **kwargs)
+
 class StudentSchema(Schema):
     """Schema for the Student model."""
     name = fields.Str(required=True)
@@ -8,9 +19,10 @@ class StudentSchema(Schema):
 class PresenceSchema(Schema):
     """Schema for the Presence model."""
     student_id = fields.Int(required=True)
-    day = fields.Int(required=True, validate=validate.Range(min=1, max=7))
-    start_time = fields.Time(required=True)
-    end_time = fields.Time(required=True)
+    # Days are numbered from the Monday of the first week, so day 8 is the Monday of week two.
+    day = fields.Int(required=True, validate=validate.Range(min=1, max=MAX_DAY))
+    start_time = TimeField(required=True)
+    end_time = TimeField(required=True)
     room = fields.Str(required=True)
 
     @validates_schema
@@ -19,4 +31,4 @@ class PresenceSchema(Schema):
         end_time = data.get('end_time')
         if start_time and end_time:
             if start_time >= end_time:
-                raise ValidationError("end_time must be after start_time")
+                raise ValidationError("end_time must be after start_time", field_name="end_time")
@@ -1,10 +1,40 @@
 """This module contains the services that interact with the repositories to perform business logic."""
 
+import sys
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from .repositories import StudentRepository
 from .models import Student, presence_factory, student_factory
 from .repositories import PresenceRepository
+from .registry import StudentRegistry
+from .reports import TextReportWriter
+from .timeseries import AttendanceTimeSeries
+from .histogram import AttendanceHistogram, SCHOOL_DAYS_PER_WEEK, WEEKDAYS, popcount, week_of
 from datetime import time
+from typing import Iterator, Optional
+
+# Presences shorter than this many minutes are not counted in reports.
+MIN_PRESENCE_MINUTES = 5
+
+
+class StudentNotFoundError(ValueError):
+    """
+    Raised when a presence refers to a student that was never registered.
+    """
+    error_class = "unknown_student"
+
+
+class ArchivedRangeError(ValueError):
+    """
+    Raised when a report range covers weeks that were moved to an archive.
+    """
+
+
+class DuplicateStudentError(ValueError):
+    """
+    Raised when a student is registered twice.
+    """
+    error_class = "duplicate_student"
 
 
 class StudentService:
@@ -12,22 +42,38 @@ class StudentService:
     Service class for managing student-related operations.
     """
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, registry: Optional[StudentRegistry] = None):
         self.db = db
         self.student_repo = StudentRepository(db)
+        self.registry = registry if registry is not None else StudentRegistry()
 
     def add_student(self, name: str) -> Student:
         """
         Add a new student to the database.
 
+        Names already in the registry are rejected before touching the database.
+
         Args:
             name (str): The name of the student.
 
         Returns:
             Student: The newly created student object.
+
+        Raises:
+            DuplicateStudentError: If a student with the same name exists.
         """
+        self.registry.load(self.student_repo.iter_names)
+        name = sys.intern(name)
+        if name in self.registry:
+            raise DuplicateStudentError(f"Student {name} already exists")
+
         student = student_factory(name=name)
-        return self.student_repo.create(student)
+        try:
+            student = self.student_repo.create(student)
+        except IntegrityError:
+            raise DuplicateStudentError(f"Student {name} already exists")
+        self.registry.add(student.name, student.id)
+        return student
 
     def get_all_students(self) -> list[Student]:
         """
@@ -44,10 +90,17 @@ class PresenceService:
     Service class for managing student presence records and generating reports.
     """
 
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: Session,
+        registry: Optional[StudentRegistry] = None,
+        timeseries: Optional[AttendanceTimeSeries] = None,
+    ):
         self.db = db
         self.presence_repo = PresenceRepository(db)
         self.student_repo = StudentRepository(db)
+        self.registry = registry if registry is not None else StudentRegistry()
+        self.timeseries = timeseries
 
     def record_presence(
         self, name: str, day: int, start_time: time, end_time: time, room: str
@@ -66,15 +119,21 @@ class PresenceService:
             Presence: The newly created presence record.
 
         Raises:
-            ValueError: If the student does not exist.
+            StudentNotFoundError: If the student does not exist. Names missing from the
+                registry are looked up in the database, since students can be added without it.
         """
-        student = self.student_repo.get_by_name(name)
+        self.registry.load(self.student_repo.iter_names)
+        student_id = self.registry.get_id(name)
 
-        if not student:
-            raise ValueError(f"Student {name} does not exist")
+        if student_id is None:
+            student = self.student_repo.get_by_name(name)
+            if not student:
+                raise StudentNotFoundError(f"Student {name} does not exist")
+            student_id = student.id
+            self.registry.add(student.name, student_id)
 
         presence_data = {
-            "student_id": student.id,
+            "student_id": student_id,
             "day": day,
             "start_time": start_time,
             "end_time": end_time,
@@ -83,41 +142,161 @@ class PresenceService:
 
         presence = presence_factory(**presence_data)
 
-        return self.presence_repo.create(presence)
+        presence = self.presence_repo.create(presence)
+        counted = self._calculate_duration(presence.start_time, presence.end_time) >= MIN_PRESENCE_MINUTES
+        if counted and self.timeseries is not None:
+            self.timeseries.add(student_id, presence.day, presence.start_time, presence.end_time, presence.room)
+        return presence
 
-    def generate_report(self) -> list[str]:
+    def generate_report(self, batch_size: int = 1000) -> list[str]:
         """
         Generate a report of student presence.
 
+        Students and presences are streamed once each and merge-joined, so only one
+        summary tuple per student is kept in memory, however many presences there are.
+
+        Args:
+            batch_size (int): The number of rows fetched from the database per round trip.
+
         Returns:
             list[str]: A list of formatted strings representing each student's presence report, sorted by total minutes in descending order.
         """
-        students = self.student_repo.get_all()
-        report = [self._generate_student_report(student) for student in students]
-        sorted_report = sorted(report, key=lambda x: x[1], reverse=True)
-        return [self._format_report_entry(entry) for entry in sorted_report]
+        return [self._format_report_entry(entry) for entry in self.iter_report(batch_size, low_memory=True)]
+
+    def iter_student_reports(
+        self, batch_size: int = 1000, first_day: Optional[int] = None, last_day: Optional[int] = None
+    ) -> Iterator[tuple[str, int, int]]:
+        """
+        Stream the report entry of every student, in student ID order.
+
+        Both queries return plain rows in student ID order, so no ORM objects are kept in
+        the session and each presence is read exactly once.
+
+        Args:
+            batch_size (int): The number of rows fetched from the database per round trip.
+            first_day (Optional[int]): The first day to include, or None for no lower bound.
+            last_day (Optional[int]): The last day to include, or None for no upper bound.
+
+        Returns:
+            Iterator[tuple[str, int, int]]: Tuples of (student_name, total_minutes, days_attended).
+        """
+        presences = self.presence_repo.iter_ordered_by_student(batch_size, first_day, last_day)
+        presence = next(presences, None)
+
+        for student_id, name in self.student_repo.iter_names(batch_size):
+            total_minutes = 0
+            days_mask = 0
+
+            # Skip presences of students that no longer exist.
+            while presence is not None and presence[0] < student_id:
+                presence = next(presences, None)
+
+            while presence is not None and presence[0] == student_id:
+                _, day, start_time, end_time = presence
+                duration = self._calculate_duration(start_time, end_time)
+                if duration >= MIN_PRESENCE_MINUTES:
+                    total_minutes += duration
+                    days_mask |= 1 << (day - 1)
+                presence = next(presences, None)
+
+            yield (name, total_minutes, popcount(days_mask))
+
+    def iter_report(
+        self,
+        batch_size: int = 1000,
+        first_day: Optional[int] = None,
+        last_day: Optional[int] = None,
+        low_memory: bool = False,
+    ) -> Iterator[tuple[str, int, int]]:
+        """
+        Stream the report entries without materializing them.
+
+        By default SQLite aggregates and sorts the totals. With ``low_memory`` the
+        presences are merge-joined with the students in Python instead, so SQLite
+        streams rows in index order and only the sort of one tuple per student is
+        kept in memory. Both give the same entries in the same order.
 
-    def _generate_student_report(self, student: Student) -> tuple[str, int, int]:
+        Args:
+            batch_size (int): The number of rows fetched from the database per round trip.
+            first_day (Optional[int]): The first day to include, or None for no lower bound.
+            last_day (Optional[int]): The last day to include, or None for no upper bound.
+            low_memory (bool): Whether to aggregate with the merge join instead of in SQLite.
+
+        Returns:
+            Iterator[tuple[str, int, int]]: Tuples of (student_name, total_minutes, days_attended),
+            sorted by total minutes in descending order.
+
+        Raises:
+            ArchivedRangeError: If a day range is given and starts before the archived weeks
+                cutoff. Without a range the report covers the weeks still in the live database.
+        """
+        if first_day is not None or last_day is not None:
+            archive = self.presence_repo.get_latest_archive()
+            if archive is not None and week_of(first_day or 1) < archive.before_week:
+                raise ArchivedRangeError(
+                    f"Weeks before {archive.before_week} are archived in {archive.path}; report on the archive instead"
+                )
+        if low_memory:
+            # The sort is stable, so ties keep the student ID order of the SQL report.
+            report = self.iter_student_reports(batch_size, first_day, last_day)
+            return iter(sorted(report, key=lambda entry: entry[1], reverse=True))
+        return self.presence_repo.iter_report_rows(MIN_PRESENCE_MINUTES, batch_size, first_day, last_day)
+
+    def load_timeseries(self) -> AttendanceTimeSeries:
         """
-        Generate a report for a single student.
+        Rebuild the time series from the presences already stored, creating it if needed.
+
+        Returns:
+            AttendanceTimeSeries: The time series, kept up to date by ``record_presence`` afterwards.
+        """
+        if self.timeseries is None:
+            self.timeseries = AttendanceTimeSeries()
+        self.timeseries.rebuild(
+            presence for presence in self.presence_repo.iter_all()
+            if self._calculate_duration(presence[2], presence[3]) >= MIN_PRESENCE_MINUTES
+        )
+        return self.timeseries
+
+    def archive_weeks(self, before_week: int, archive_path: str) -> int:
+        """
+        Move the presences of old weeks out of the live database.
 
         Args:
-            student (Student): The student object.
+            before_week (int): The first week index to keep in the live database.
+            archive_path (str): The path of the archive SQLite file.
+
+        Returns:
+            int: The number of presence records archived.
+        """
+        return self.presence_repo.archive_weeks(before_week, archive_path)
+
+    def weekly_histogram(self) -> AttendanceHistogram:
+        """
+        Build the weekday attendance histogram, one mask per student and week.
+
+        The masks are derived from the attended days at report time, so recording a
+        presence costs no extra statement and weeks are never folded together.
 
         Returns:
-            tuple[str, int, int]: A tuple containing the student's name, total minutes present, and number of days attended.
+            AttendanceHistogram: The histogram of every student.
         """
-        presences = self.presence_repo.get_by_student(student.id)
-        total_minutes = 0
-        days_attended = set()
+        return AttendanceHistogram.from_attended_days(self.presence_repo.iter_attended_days(MIN_PRESENCE_MINUTES))
 
-        for presence in presences:
-            duration = self._calculate_duration(presence.start_time, presence.end_time)
-            if duration >= 5:
-                total_minutes += duration
-                days_attended.add(presence.day)
+    def generate_weekly_report(self) -> list[str]:
+        """
+        Generate a report of attendance per weekday.
 
-        return (student.name, total_minutes, len(days_attended))
+        Returns:
+            list[str]: One line per weekday with the number of students present on that weekday in
+            any week, followed by the students that attended every day of the school week in every week.
+        """
+        histogram = self.weekly_histogram()
+        report = [
+            f"{weekday}: {count} {'student' if count == 1 else 'students'}"
+            for weekday, count in zip(WEEKDAYS, histogram.weekday_students())
+        ]
+        report.append(f"Every day: {', '.join(histogram.attended_every_day(SCHOOL_DAYS_PER_WEEK)) or 'none'}")
+        return report
 
     def _calculate_duration(self, start_time: time, end_time: time) -> int:
         """
@@ -144,8 +323,4 @@ class PresenceService:
         Returns:
             str: A formatted string representing the report entry.
         """
-        student_name, total_minutes, days = entry
-        day_str = "day" if days == 1 else "days"
-        time_str = f"{total_minutes} minutes"
-        days_str = f" in {days} {day_str}" if days > 0 else ""
-        return f"{student_name}: {time_str}{days_str}"
+        return TextReportWriter.format_text(entry)
@@ -0,0 +1,118 @@
+""" Read-only snapshots of the database for reporting. """
+import itertools
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import SingletonThreadPool
+
+_snapshot_ids = itertools.count()
+
+class DatabaseSnapshot:
+    """
+    In-memory replica of a SQLite database for serving reports while ingest continues.
+
+    Each refresh copies the source with SQLite's online backup API in a single
+    step, so the copy is consistent, into a new in-memory database. The new
+    copy then replaces the current one. Sessions that are already open keep
+    reading the copy they started on.
+
+    The source is switched to WAL mode, so writers keep going while a copy
+    is taken. Reports never block writes to the source, though a refresh
+    waits for a checkpoint or a change of journal mode in progress. Each
+    thread reads the snapshot through its own connection, so sessions can
+    be opened from several threads, but a session must stay in its thread.
+
+    Attributes:
+        source (Engine): The engine of the database being copied.
+        max_age (float): The age in seconds after which ``session`` refreshes the snapshot.
+        taken_at (Optional[float]): The clock time of the last refresh, None before the first one.
+    """
+
+    def __init__(self, source: Engine, max_age: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        self.source = source
+        self.max_age = max_age
+        self.taken_at: Optional[float] = None
+        self._clock = clock
+        self._session_factory: Optional[sessionmaker] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
+        with source.connect() as connection:
+            connection.execute(text("PRAGMA journal_mode=WAL"))
+
+    @property
+    def staleness(self) -> Optional[float]:
+        """The age of the snapshot in seconds, None before the first refresh."""
+        if self.taken_at is None:
+            return None
+        return self._clock() - self.taken_at
+
+    def refresh(self) -> None:
+        """
+        Take a new consistent copy of the source database.
+        """
+        # The copy holds the source as of the start of the backup.
+        taken_at = self._clock()
+        uri = f"file:snapshot-{next(_snapshot_ids)}?mode=memory&cache=shared"
+        replica = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        source = self.source.raw_connection()
+        try:
+            source.driver_connection.backup(replica)
+        finally:
+            source.close()
+
+        # A shared cache in-memory database lives while any connection to it is open,
+        # so every session keeps the connection the copy was made on.
+        engine = create_engine(
+            "sqlite://", creator=lambda: sqlite3.connect(uri, uri=True, check_same_thread=False),
+            poolclass=SingletonThreadPool,
+        )
+        with self._lock:
+            self._session_factory = sessionmaker(bind=engine, autoflush=False, info={"replica": replica})
+            self.taken_at = taken_at
+
+    def session(self) -> Session:
+        """
+        Open a session on the snapshot, refreshing it first when older than ``max_age``.
+
+        Returns:
+            Session: A session reading from the snapshot.
+        """
+        staleness = self.staleness
+        if staleness is None or staleness > self.max_age:
+            self.refresh()
+        with self._lock:
+            return self._session_factory()
+
+    def start(self, interval: float) -> None:
+        """
+        Refresh the snapshot every ``interval`` seconds in a background thread.
+
+        Args:
+            interval (float): The number of seconds between refreshes.
+        """
+        if self._refresher is not None:
+            return
+        self._stop.clear()
+        self.refresh()
+        self._refresher = threading.Thread(
+            target=self._refresh_periodically, args=(interval,), name="snapshot-refresher", daemon=True
+        )
+        self._refresher.start()
+
+    def stop(self) -> None:
+        """
+        Stop the background refreshes.
+        """
+        if self._refresher is not None:
+            self._stop.set()
+            self._refresher.join()
+            self._refresher = None
+
+    def _refresh_periodically(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self.refresh()
@@ -0,0 +1,238 @@
+""" Bucketed attendance time series, kept up to date as presences are recorded. """
+import csv
+import struct
+from array import array
+from datetime import time
+from typing import BinaryIO, Iterable, TextIO
+
+MINUTES_PER_DAY = 24 * 60
+BINARY_MAGIC = b"ATS2"
+
+def _minutes(value: time) -> int:
+    return value.hour * 60 + value.minute
+
+class AttendanceTimeSeries:
+    """
+    Per-room headcount per time bucket and per-student minutes per day.
+
+    Every room has one ``array('I')`` of bucket counters per day it was used,
+    and every student one counter per day attended, both keyed by day so memory
+    depends on the days present rather than on the largest day number. ``add``
+    updates them as each presence is recorded, so series and rolling windows
+    are read straight from the counters in O(buckets) instead of being rebuilt
+    from the presences table.
+
+    Attributes:
+        bucket_minutes (int): The width of a room bucket in minutes.
+        buckets_per_day (int): The number of room buckets per day.
+        rooms (dict[str, dict[int, array]]): The headcount per bucket of every room, by day.
+        students (dict[int, dict[int, int]]): The minutes attended of every student, by day.
+    """
+
+    def __init__(self, bucket_minutes: int = 15):
+        if MINUTES_PER_DAY % bucket_minutes:
+            raise ValueError(f"bucket_minutes must divide {MINUTES_PER_DAY}")
+        self.bucket_minutes = bucket_minutes
+        self.buckets_per_day = MINUTES_PER_DAY // bucket_minutes
+        self.rooms: dict[str, dict[int, array]] = {}
+        self.students: dict[int, dict[int, int]] = {}
+
+    def add(self, student_id: int, day: int, start_time: time, end_time: time, room: str) -> None:
+        """
+        Count a presence in the room and student series.
+
+        Args:
+            student_id (int): The ID of the student.
+            day (int): The day of presence.
+            start_time (time): The start time of presence.
+            end_time (time): The end time of presence.
+            room (str): The room where the student was present.
+        """
+        start, end = _minutes(start_time), _minutes(end_time)
+
+        days = self.rooms.setdefault(room, {})
+        counts = days.get(day)
+        if counts is None:
+            counts = days[day] = self._empty_day()
+        for bucket in range(start // self.bucket_minutes, (end - 1) // self.bucket_minutes + 1):
+            counts[bucket] += 1
+
+        minutes = self.students.setdefault(student_id, {})
+        minutes[day] = minutes.get(day, 0) + end - start
+
+    def rebuild(self, presences: Iterable[tuple[int, int, time, time, str]]) -> None:
+        """
+        Reset the series and count existing presences, e.g. when attaching to a populated database.
+
+        Args:
+            presences (Iterable[tuple[int, int, time, time, str]]): Tuples of
+                (student_id, day, start_time, end_time, room).
+        """
+        self.rooms.clear()
+        self.students.clear()
+        for presence in presences:
+            self.add(*presence)
+
+    def room_series(self, room: str, first_day: int, last_day: int) -> list[int]:
+        """
+        Get the headcount of a room per bucket over a range of days.
+
+        Args:
+            room (str): The room.
+            first_day (int): The first day of the range.
+            last_day (int): The last day of the range.
+
+        Returns:
+            list[int]: One count per bucket, ``buckets_per_day`` per day.
+        """
+        days = self.rooms.get(room, {})
+        empty = [0] * self.buckets_per_day
+        series = []
+        for day in range(first_day, last_day + 1):
+            counts = days.get(day)
+            series.extend(counts if counts is not None else empty)
+        return series
+
+    def moving_average(self, room: str, first_day: int, last_day: int, window: int) -> list[float]:
+        """
+        Get the moving average of a room headcount over a range of days.
+
+        Args:
+            room (str): The room.
+            first_day (int): The first day of the range.
+            last_day (int): The last day of the range.
+            window (int): The number of buckets averaged.
+
+        Returns:
+            list[float]: The average of each window of buckets, starting with the first full window.
+        """
+        series = self.room_series(room, first_day, last_day)
+        total = sum(series[:window])
+        averages = [total / window] if len(series) >= window else []
+        for index in range(window, len(series)):
+            total += series[index] - series[index - window]
+            averages.append(total / window)
+        return averages
+
+    def student_total(self, student_id: int, last_day: int, days: int) -> int:
+        """
+        Get the minutes a student attended over the last ``days`` days.
+
+        Args:
+            student_id (int): The ID of the student.
+            last_day (int): The last day of the window.
+            days (int): The length of the window in days.
+
+        Returns:
+            int: The minutes attended in the window.
+        """
+        minutes = self.students.get(student_id, {})
+        first_day = last_day - days + 1
+        if days > len(minutes):
+            return sum(value for day, value in minutes.items() if first_day <= day <= last_day)
+        return sum(minutes.get(day, 0) for day in range(first_day, last_day + 1))
+
+    def rolling_student_totals(self, last_day: int, days: int) -> dict[int, int]:
+        """
+        Get the minutes every student attended over the last ``days`` days.
+
+        Args:
+            last_day (int): The last day of the window.
+            days (int): The length of the window in days.
+
+        Returns:
+            dict[int, int]: The minutes attended in the window, by student ID.
+        """
+        return {student_id: self.student_total(student_id, last_day, days) for student_id in self.students}
+
+    def write_csv(self, stream: TextIO) -> None:
+        """
+        Write the non-empty room buckets as ``room,day,start,count`` CSV rows.
+
+        Args:
+            stream (TextIO): The stream to write to.
+        """
+        writer = csv.writer(stream, lineterminator="\n")
+        writer.writerow(("room", "day", "start", "count"))
+        for room, days in sorted(self.rooms.items()):
+            for day, counts in sorted(days.items()):
+                for bucket, count in enumerate(counts):
+                    if count:
+                        start = bucket * self.bucket_minutes
+                        writer.writerow((room, day, f"{start // 60:02d}:{start % 60:02d}", count))
+
+    def write_student_csv(self, stream: TextIO) -> None:
+        """
+        Write the non-empty student days as ``student_id,day,minutes`` CSV rows.
+
+        Args:
+            stream (TextIO): The stream to write to.
+        """
+        writer = csv.writer(stream, lineterminator="\n")
+        writer.writerow(("student_id", "day", "minutes"))
+        for student_id, minutes in sorted(self.students.items()):
+            writer.writerows((student_id, day, value) for day, value in sorted(minutes.items()) if value)
+
+    def write_binary(self, stream: BinaryIO) -> None:
+        """
+        Write the room series in a compact binary form.
+
+        The layout is the ``ATS2`` magic, the bucket width and room count, then for
+        each room its UTF-8 name and day count, and for each day its number and its
+        ``buckets_per_day`` little-endian 32-bit counters.
+
+        Args:
+            stream (BinaryIO): The stream to write to.
+        """
+        stream.write(BINARY_MAGIC + struct.pack("<HI", self.bucket_minutes, len(self.rooms)))
+        for room, days in sorted(self.rooms.items()):
+            name = room.encode()
+            stream.write(struct.pack("<H", len(name)) + name + struct.pack("<I", len(days)))
+            for day, counts in sorted(days.items()):
+                stream.write(struct.pack("<I", day) + _little_endian(counts).tobytes())
+
+    @classmethod
+    def read_binary(cls, stream: BinaryIO) -> "AttendanceTimeSeries":
+        """
+        Read room series written by ``write_binary``.
+
+        Args:
+            stream (BinaryIO): The stream to read from.
+
+        Returns:
+            AttendanceTimeSeries: The series, without student totals.
+
+        Raises:
+            ValueError: If the stream is not in the expected format.
+        """
+        if stream.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+            raise ValueError("Not an attendance time series")
+        bucket_minutes, room_count = struct.unpack("<HI", stream.read(6))
+        series = cls(bucket_minutes)
+        for _ in range(room_count):
+            (name_length,) = struct.unpack("<H", stream.read(2))
+            room = stream.read(name_length).decode()
+            (day_count,) = struct.unpack("<I", stream.read(4))
+            days = series.rooms[room] = {}
+            for _ in range(day_count):
+                (day,) = struct.unpack("<I", stream.read(4))
+                counts = array('I')
+                counts.frombytes(stream.read(series.buckets_per_day * counts.itemsize))
+                days[day] = _little_endian(counts)
+        return series
+
+    def _empty_day(self) -> array:
+        """
+        Return a zeroed day of bucket counters.
+        """
+        return array('I', bytes(self.buckets_per_day * array('I').itemsize))
+
+def _little_endian(counts: array) -> array:
+    """
+    Return the counters in little-endian byte order, swapping a copy on big-endian hosts.
+    """
+    if struct.pack("=I", 1) == struct.pack("<I", 1):
+        return counts
+    swapped = array('I', counts)
+    swapped.byteswap()
+    return swapped
@@ -0,0 +1,68 @@
+""" Measure the memory used by PresenceService.generate_report on a synthetic database.
+
+Usage:
+    python benchmarks/bench_report_memory.py [--students 1000] [--presences 1000000]
+
+Prints the Python heap peak (tracemalloc) of the report itself and the process
+peak RSS. With the streaming merge join the heap peak depends on the number of
+students and the batch size only, not on the number of presences.
+"""
+import argparse
+import datetime
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from app import init_db  # noqa: E402
+from app.models import Presence, Student  # noqa: E402
+from app.services import PresenceService  # noqa: E402
+
+def populate(engine, students, presences, chunk=10_000):
+    start, end = datetime.time(9, 0), datetime.time(10, 30)
+    with engine.begin() as connection:
+        connection.execute(insert(Student), [{"name": f"S{index}"} for index in range(students)])
+        for offset in range(0, presences, chunk):
+            connection.execute(insert(Presence), [
+                {
+                    "student_id": index % students + 1, "day": index % 7 + 1, "week": 0,
+                    "start_time": start, "end_time": end, "room": "R100",
+                }
+                for index in range(offset, min(offset + chunk, presences))
+            ])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--presences", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'attendance.db')}")
+        init_db(engine)
+        populate(engine, args.students, args.presences)
+        session = sessionmaker(bind=engine)()
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        report = PresenceService(session).generate_report(args.batch_size)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        session.close()
+        engine.dispose()
+
+    max_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"students={args.students} presences={args.presences} entries={len(report)}")
+    print(f"report: {elapsed:.2f} s, heap peak {peak / 2**20:.1f} MiB, process peak RSS {max_rss_kb / 2**10:.1f} MiB")
+
+if __name__ == "__main__":
+    main()
@@ -1,45 +1,80 @@
+import argparse
 import sys
-from app import init_db, SessionLocal
-from app.services import StudentService
-from app.services import PresenceService
+from app import init_db
+from app.registry import StudentRegistry
 from app.commands import CommandFactory
-from sqlalchemy import text
-from app.logger_config import logger
+from app.reports import ReportWriterFactory
+from app.rejections import RejectionLog
+from app.timeseries import AttendanceTimeSeries
+from app.logger_config import logger, configure_logging
 
 def truncate_tables(db):
+    from sqlalchemy import text
+
     db.execute(text("PRAGMA foreign_keys = OFF;"))
     db.execute(text("DELETE FROM students;"))
     db.execute(text("DELETE FROM presences;"))
+    db.execute(text("DELETE FROM archives;"))
     db.execute(text("PRAGMA foreign_keys = ON;"))
     db.commit()
 
-def main(input_file):
+def main(input_file, report_format='text', report='attendance', first_day=None, last_day=None, rejections_file=None,
+         timeseries_file=None, low_memory=False):
+    # SQLAlchemy and marshmallow are only imported once there is work to do,
+    # so that importing this module and argument errors stay fast.
+    from app import SessionLocal
+    from app.services import StudentService, PresenceService
+
+    configure_logging()
     init_db()
     db = SessionLocal()
 
     truncate_tables(db)
 
-    student_service = StudentService(db)
-    presence_service = PresenceService(db)
+    registry = StudentRegistry()
+    student_service = StudentService(db, registry)
+    timeseries = AttendanceTimeSeries() if timeseries_file else None
+    presence_service = PresenceService(db, registry, timeseries)
     command_factory = CommandFactory(student_service, presence_service)
 
-    with open(input_file, 'r') as file:
-        for line in file:
-            parts = line.strip().split()
-            command_name = parts[0]
-            command = command_factory.get_command(command_name)
+    rejections = RejectionLog(rejections_file or f"{input_file}.rejected")
+    with open(input_file, 'r') as file, rejections:
+        for line_number, line in enumerate(file, start=1):
+            try:
+                parsed = command_factory.parse_line(line, line_number)
+                if parsed:
+                    command, args = parsed
+                    command.execute(*args)
+            except Exception as e:
+                rejections.reject(line_number, line, e)
+
+    if rejections.total:
+        summary = ", ".join(f"{error_class}: {count}" for error_class, count in rejections.counts.most_common())
+        logger.error(f"Skipped {rejections.total} lines ({summary}), see {rejections.path}")
 
-            if command:
-                try:
-                    command.execute(*parts[1:])
-                except Exception as e:
-                    logger.error(f"Skipping command due to error: {e}")
+    if timeseries is not None:
+        with open(timeseries_file, 'w', newline='') as file:
+            timeseries.write_csv(file)
 
-    report = presence_service.generate_report()
+    if report == 'weekly':
+        sys.stdout.writelines(f"{line}\n" for line in presence_service.generate_weekly_report())
+        return
 
-    for line in report:
-        print(line)
+    writer = ReportWriterFactory(sys.stdout).get_writer(report_format)
+    writer.write(presence_service.iter_report(first_day=first_day, last_day=last_day, low_memory=low_memory))
 
 if __name__ == "__main__":
-    input_file = sys.argv[1] if len(sys.argv) > 1 else 'input.txt'
-    main(input_file)
+    parser = argparse.ArgumentParser(description="Track student attendance and print a report.")
+    parser.add_argument('input_file', nargs='?', default='input.txt')
+    parser.add_argument('--format', dest='report_format', default='text', choices=['text', 'jsonl', 'csv'])
+    parser.add_argument('--report', default='attendance', choices=['attendance', 'weekly'])
+    parser.add_argument('--first-day', type=int, help="first day of the report range (day 8 is the Monday of week two)")
+    parser.add_argument('--last-day', type=int, help="last day of the report range")
+    parser.add_argument('--rejections', dest='rejections_file', help="file for rejected lines (default: <input_file>.rejected)")
+    parser.add_argument('--timeseries', dest='timeseries_file', help="write the per-room attendance time series to this CSV file")
+    parser.add_argument('--low-memory', action='store_true', help="aggregate the report with a merge join instead of in SQLite")
+    args = parser.parse_args()
+    main(
+        args.input_file, args.report_format, args.report, args.first_day, args.last_day, args.rejections_file,
+        args.timeseries_file, args.low_memory,
+    )
@@ -1,5 +1,6 @@
+import pytest
 from unittest.mock import Mock
-from app.commands import StudentCommand, PresenceCommand, CommandFactory
+from app.commands import StudentCommand, PresenceCommand, CommandFactory, CommandParseError
 from datetime import time
 
 def test_student_command():
@@ -15,14 +16,14 @@ def test_presence_command():
     mock_presence_service = Mock()
     presence_command = PresenceCommand(mock_presence_service)
     student_name = "John Doe"
-    day = "1"
+    day = 1
     start_time = time(9, 0)
     end_time = time(10, 0)
     room = "101"
 
     presence_command.execute(student_name, day, start_time, end_time, room)
 
-    mock_presence_service.record_presence.assert_called_once_with(student_name, int(day), start_time, end_time, room)
+    mock_presence_service.record_presence.assert_called_once_with(student_name, day, start_time, end_time, room)
 
 def test_command_factory():
     mock_student_service = Mock()
@@ -35,4 +36,36 @@ def test_command_factory():
 
     assert isinstance(student_command, StudentCommand)
     assert isinstance(presence_command, PresenceCommand)
-    assert invalid_command is None
\ No newline at end of file
+    assert invalid_command is None
+
+def test_command_factory_parse_line():
+    command_factory = CommandFactory(Mock(), Mock())
+
+    student_command, student_args = command_factory.parse_line("Student John\n", 1)
+    presence_command, presence_args = command_factory.parse_line("Presence John 2 9:04 10:35 F100\n", 2)
+
+    assert isinstance(student_command, StudentCommand)
+    assert student_args == ("John",)
+    assert isinstance(presence_command, PresenceCommand)
+    assert presence_args == ("John", 2, time(9, 4), time(10, 35), "F100")
+    assert command_factory.parse_line("   \n", 3) is None
+
+@pytest.mark.parametrize("line, message", [
+    ("Invalid John", "line 7: unknown command 'Invalid'"),
+    ("Student", "line 7: Student expects 1 arguments, got 0"),
+    ("Presence John two 09:00 10:00 F100", "line 7: invalid literal for int()"),
+    ("Presence John 2 9h 10:00 F100", "line 7: invalid time '9h'"),
+    ("Presence John 2 9 10:00 F100", "line 7: invalid time '9'"),
+    ("Presence John 2 0900 10:00 F100", "line 7: invalid time '0900'"),
+    ("Presence John 2 09:00:00.5 10:00 F100", "line 7: invalid time '09:00:00.5'"),
+    ("Presence John 2 25:00 10:00 F100", "line 7: invalid time '25:00'"),
+    ("Presence John 2 09:00 F100", "line 7: Presence expects 5 arguments, got 4"),
+])
+def test_command_factory_parse_line_rejects(line, message):
+    command_factory = CommandFactory(Mock(), Mock())
+
+    with pytest.raises(CommandParseError) as excinfo:
+        command_factory.parse_line(line, 7)
+
+    assert str(excinfo.value).startswith(message)
+    assert excinfo.value.line_number == 7
@@ -0,0 +1,43 @@
+from array import array
+from app.histogram import AttendanceHistogram, day_bit, popcount, week_of
+
+def test_day_helpers():
+    assert day_bit(1) == 0b1
+    assert day_bit(7) == 0b1000000
+    assert day_bit(8) == 0b1
+    assert week_of(7) == 0
+    assert week_of(8) == 1
+    assert popcount(0b1010101) == 4
+
+def test_single_week():
+    histogram = AttendanceHistogram(["Marco", "David", "Fran"], [array('B', [0b101, 0b10000, 0])])
+
+    assert histogram.weekday_distribution() == [1, 0, 1, 0, 1, 0, 0]
+    assert histogram.absent_on([1, 3]) == ["David", "Fran"]
+    assert histogram.days_attended() == [2, 1, 0]
+
+def test_attended_every_day():
+    histogram = AttendanceHistogram(["Marco", "David", "Fran"], [array('B', [0b11111, 0b1111111, 0b1111])])
+
+    assert histogram.attended_every_day(5) == ["Marco", "David"]
+    assert histogram.attended_every_day() == ["David"]
+
+def test_from_attended_days_spans_weeks():
+    rows = [("Marco", 1), ("Marco", 2), ("Marco", 8), ("David", 9), ("Fran", None)]
+    histogram = AttendanceHistogram.from_attended_days(rows)
+
+    assert histogram.names == ["Marco", "David", "Fran"]
+    assert len(histogram.weeks) == 2
+    assert histogram.weekday_distribution() == [2, 2, 0, 0, 0, 0, 0]
+    assert histogram.weekday_distribution(week=1) == [1, 1, 0, 0, 0, 0, 0]
+    assert histogram.absent_on([2]) == ["David", "Fran"]
+    assert histogram.absent_on([9]) == ["Marco", "Fran"]
+    assert histogram.attended_every_day(1) == ["Marco"]
+    assert histogram.days_attended() == [3, 1, 0]
+    assert histogram.weekday_students() == [1, 2, 0, 0, 0, 0, 0]
+
+def test_attended_every_day_needs_every_week():
+    rows = [("A", 1), ("A", 2), ("A", 3), ("A", 4), ("A", 5), ("A", 11), ("A", 12), ("B", 1)]
+    histogram = AttendanceHistogram.from_attended_days(rows)
+
+    assert histogram.attended_every_day(5) == []
@@ -77,4 +77,15 @@ def test_presence_factory_invalid_data():
         "room": "101"
     }
     with pytest.raises(ValueError):
-        presence_factory(**presence_data)
\ No newline at end of file
+        presence_factory(**presence_data)
+
+def test_presence_factory_sets_week():
+    presence_data = {
+        "student_id": 1,
+        "day": 9,
+        "start_time": "09:00",
+        "end_time": "10:00",
+        "room": "101"
+    }
+    presence = presence_factory(**presence_data)
+    assert presence.week == 1
@@ -0,0 +1,149 @@
+import datetime
+import time
+import tracemalloc
+import pytest
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+from app import init_db
+from app.models import Presence, Student
+from app.registry import StudentRegistry
+from app.services import StudentService, PresenceService, DuplicateStudentError
+
+# Statement budgets are exact, and the report ones are checked at two roster
+# sizes: one more query per line or per student is an N+1 regression. Time
+# and memory budgets are several times the measured cost, so they only trip
+# on algorithmic regressions. The report memory is also compared at two
+# presence counts, since it must not grow with the number of presences.
+STATEMENTS_PER_STUDENT_LINE = 2
+STATEMENTS_PER_PRESENCE_LINE = 2
+MERGE_REPORT_STATEMENTS = 2
+SQL_REPORT_STATEMENTS = 1
+INGEST_SECONDS = 10.0
+REPORT_SECONDS = 5.0
+REPORT_PEAK_BYTES = 2 * 2**20
+REPORT_PEAK_GROWTH_BYTES = 256 * 2**10
+
+class StatementCounter:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args):
+        self.count += 1
+
+    def measure(self, fn):
+        before = self.count
+        result = fn()
+        return result, self.count - before
+
+@pytest.fixture
+def counter(engine):
+    return StatementCounter(engine)
+
+def populated_engine(path, students, presences_per_student):
+    engine = create_engine(f"sqlite:///{path}")
+    init_db(engine)
+    populate(engine, students, presences_per_student)
+    return engine
+
+def populate(engine, students, presences_per_student):
+    start, end = datetime.time(9, 0), datetime.time(10, 30)
+    with engine.begin() as connection:
+        connection.execute(insert(Student), [{"name": f"S{index}"} for index in range(students)])
+        connection.execute(insert(Presence), [
+            {
+                "student_id": student_id, "day": day % 7 + 1, "week": 0,
+                "start_time": start, "end_time": end, "room": "R100",
+            }
+            for student_id in range(1, students + 1)
+            for day in range(presences_per_student)
+        ])
+
+def test_ingest_statement_count(session, counter):
+    registry = StudentRegistry()
+    student_service = StudentService(session, registry)
+    presence_service = PresenceService(session, registry)
+    students, presences_per_student = 50, 5
+
+    _, student_statements = counter.measure(
+        lambda: [student_service.add_student(f"S{index}") for index in range(students)]
+    )
+    _, presence_statements = counter.measure(lambda: [
+        presence_service.record_presence(f"S{index}", day + 1, "09:00", "10:00", "R100")
+        for index in range(students)
+        for day in range(presences_per_student)
+    ])
+
+    # One extra statement loads the registry.
+    assert student_statements == STATEMENTS_PER_STUDENT_LINE * students + 1
+    assert presence_statements == STATEMENTS_PER_PRESENCE_LINE * students * presences_per_student
+
+def test_duplicate_student_does_not_query(session, counter):
+    student_service = StudentService(session)
+    student_service.add_student("S0")
+
+    before = counter.count
+    with pytest.raises(DuplicateStudentError):
+        student_service.add_student("S0")
+
+    assert counter.count == before
+
+@pytest.mark.parametrize("report, expected", [
+    ("generate_report", MERGE_REPORT_STATEMENTS),
+    ("iter_report", SQL_REPORT_STATEMENTS),
+])
+def test_report_statement_count_is_constant(tmp_path, report, expected):
+    counts = []
+    for students in (20, 200):
+        engine = populated_engine(tmp_path / f"attendance-{students}.db", students, presences_per_student=3)
+        counter = StatementCounter(engine)
+        session = sessionmaker(bind=engine)()
+
+        report_lines, statements = counter.measure(lambda: list(getattr(PresenceService(session), report)()))
+
+        session.close()
+        engine.dispose()
+        assert len(report_lines) == students
+        counts.append(statements)
+
+    assert counts == [expected, expected]
+
+def test_ingest_time_budget(session):
+    registry = StudentRegistry()
+    student_service = StudentService(session, registry)
+    presence_service = PresenceService(session, registry)
+
+    started = time.perf_counter()
+    for index in range(100):
+        student_service.add_student(f"S{index}")
+        for day in range(1, 6):
+            presence_service.record_presence(f"S{index}", day, "09:00", "10:00", "R100")
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < INGEST_SECONDS
+
+def test_report_time_and_memory_budget(tmp_path):
+    peaks = []
+    for presences_per_student in (10, 80):
+        engine = populated_engine(tmp_path / f"attendance-{presences_per_student}.db", 500, presences_per_student)
+        session = sessionmaker(bind=engine)()
+        presence_service = PresenceService(session)
+        # Warm up the statement cache so that it is not counted in the first peak.
+        presence_service.generate_report()
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        report = presence_service.generate_report()
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        session.close()
+        engine.dispose()
+        assert len(report) == 500
+        assert report[0] == f"S0: {90 * presences_per_student} minutes in 7 days"
+        assert elapsed < REPORT_SECONDS
+        assert peak < REPORT_PEAK_BYTES
+        peaks.append(peak)
+
+    assert peaks[1] - peaks[0] < REPORT_PEAK_GROWTH_BYTES
@@ -0,0 +1,24 @@
+from unittest.mock import MagicMock
+from app.registry import StudentRegistry
+
+def test_load_runs_once():
+    registry = StudentRegistry()
+    rows = MagicMock(return_value=[(1, "John Doe"), (2, "Jane Doe")])
+
+    registry.load(rows)
+    registry.load(rows)
+
+    rows.assert_called_once()
+    assert len(registry) == 2
+    assert registry.get_id("Jane Doe") == 2
+    assert "John Doe" in registry
+    assert registry.get_id("Fran") is None
+
+def test_add_interns_name():
+    registry = StudentRegistry()
+    name = "".join(["John", " Doe"])
+
+    interned = registry.add(name, 1)
+
+    assert interned is registry.add("".join(["John", " ", "Doe"]), 1)
+    assert registry.get_id("John Doe") == 1
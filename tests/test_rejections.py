@@ -0,0 +1,77 @@
+import pytest
+from unittest.mock import patch
+from app.commands import CommandParseError
+from app.models import InvalidDataError
+from app.rejections import RejectionLog, classify_error
+from app.services import StudentNotFoundError
+
+def test_classify_error():
+    assert classify_error(CommandParseError(1, "unknown command 'Foo'", "unknown_command")) == "unknown_command"
+    assert classify_error(CommandParseError(1, "bad")) == "malformed_line"
+    assert classify_error(StudentNotFoundError("Student John does not exist")) == "unknown_student"
+    assert classify_error(InvalidDataError({"day": ["Must be greater than or equal to 1."]})) == "invalid_day"
+    assert classify_error(InvalidDataError({"end_time": ["end_time must be after start_time"]})) == "end_before_start"
+    assert classify_error(RuntimeError("boom")) == "RuntimeError"
+
+def test_rejection_log_writes_sidecar(tmp_path):
+    path = tmp_path / "input.txt.rejected"
+
+    with RejectionLog(str(path)) as rejections:
+        rejections.reject(2, "Presence John 1 09:00 10:00 R1\n", StudentNotFoundError("Student John does not exist"))
+        rejections.reject(5, "Foo\n", CommandParseError(5, "unknown command 'Foo'", "unknown_command"))
+        rejections.reject(6, "Bar\n", CommandParseError(6, "unknown command 'Bar'", "unknown_command"))
+
+    assert rejections.total == 3
+    assert rejections.counts == {"unknown_student": 1, "unknown_command": 2}
+    assert path.read_text().splitlines() == [
+        "2\tunknown_student\tStudent John does not exist\tPresence John 1 09:00 10:00 R1",
+        "5\tunknown_command\tunknown command 'Foo'\tFoo",
+        "6\tunknown_command\tunknown command 'Bar'\tBar",
+    ]
+
+def test_rejection_log_without_rejections_creates_no_file(tmp_path):
+    path = tmp_path / "input.txt.rejected"
+
+    with RejectionLog(str(path)) as rejections:
+        pass
+
+    assert rejections.total == 0
+    assert not path.exists()
+
+def test_rejection_log_truncates_stale_sidecar_on_first_rejection(tmp_path):
+    path = tmp_path / "input.txt.rejected"
+    path.write_text("3\tunknown_student\tStudent Ann does not exist\tPresence Ann 1 09:00 10:00 R1\n")
+
+    with RejectionLog(str(path)) as rejections:
+        rejections.reject(1, "Foo\n", CommandParseError(1, "unknown command 'Foo'", "unknown_command"))
+
+    assert path.read_text() == "1\tunknown_command\tunknown command 'Foo'\tFoo\n"
+
+def test_rejection_log_fails_on_unwritable_path(tmp_path):
+    rejections = RejectionLog(str(tmp_path / "missing" / "input.txt.rejected"))
+
+    with rejections:
+        pass
+    with pytest.raises(OSError):
+        with rejections:
+            rejections.reject(1, "Foo\n", CommandParseError(1, "unknown command 'Foo'", "unknown_command"))
+
+def test_rejection_log_raises_writer_failure_on_close(tmp_path):
+    rejections = RejectionLog(str(tmp_path / "input.txt.rejected"))
+
+    with patch("app.rejections.csv.writer") as writer:
+        writer.return_value.writerow.side_effect = OSError("No space left on device")
+        with pytest.raises(OSError, match="No space left on device"):
+            with rejections:
+                rejections.reject(1, "Foo\n", CommandParseError(1, "unknown command 'Foo'", "unknown_command"))
+                rejections.reject(2, "Bar\n", CommandParseError(2, "unknown command 'Bar'", "unknown_command"))
+
+def test_rejection_log_keeps_error_of_with_block(tmp_path):
+    rejections = RejectionLog(str(tmp_path / "input.txt.rejected"))
+
+    with patch("app.rejections.csv.writer") as writer:
+        writer.return_value.writerow.side_effect = OSError("No space left on device")
+        with pytest.raises(RuntimeError, match="boom"):
+            with rejections:
+                rejections.reject(1, "Foo\n", CommandParseError(1, "unknown command 'Foo'", "unknown_command"))
+                raise RuntimeError("boom")
@@ -0,0 +1,37 @@
+import io
+from app.reports import (
+    ReportWriterFactory, TextReportWriter, JsonLinesReportWriter, CsvReportWriter
+)
+
+ENTRIES = [("Marco", 142, 2), ("David", 104, 1), ("Fran", 0, 0)]
+
+def test_text_report_writer():
+    stream = io.StringIO()
+    count = TextReportWriter(stream).write(iter(ENTRIES))
+    assert count == 3
+    assert stream.getvalue() == "Marco: 142 minutes in 2 days\nDavid: 104 minutes in 1 day\nFran: 0 minutes\n"
+
+def test_json_lines_report_writer():
+    stream = io.StringIO()
+    JsonLinesReportWriter(stream).write(ENTRIES[:1])
+    assert stream.getvalue() == '{"name": "Marco", "minutes": 142, "days": 2}\n'
+
+def test_csv_report_writer():
+    stream = io.StringIO()
+    CsvReportWriter(stream).write(ENTRIES)
+    assert stream.getvalue() == "name,minutes,days\nMarco,142,2\nDavid,104,1\nFran,0,0\n"
+
+def test_report_writer_writes_in_chunks():
+    stream = io.StringIO()
+    writes = []
+    stream.write = writes.append
+    TextReportWriter(stream, chunk_size=2).write(ENTRIES)
+    assert writes == ["Marco: 142 minutes in 2 days\nDavid: 104 minutes in 1 day\n", "Fran: 0 minutes\n"]
+
+def test_report_writer_factory():
+    factory = ReportWriterFactory(io.StringIO())
+
+    assert isinstance(factory.get_writer('text'), TextReportWriter)
+    assert isinstance(factory.get_writer('jsonl'), JsonLinesReportWriter)
+    assert isinstance(factory.get_writer('csv'), CsvReportWriter)
+    assert factory.get_writer('xml') is None
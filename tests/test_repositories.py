@@ -1,6 +1,9 @@
+import datetime
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import sessionmaker
+from app import SCHEMA_VERSION
 from app.models import Base, Student, presence_factory
 from app.repositories import StudentRepository, PresenceRepository
 
@@ -63,4 +66,126 @@ def get_presence_mock():
         "start_time": "08:00",
         "end_time": "09:00",
         "room": "test"
-    }
\ No newline at end of file
+    }
+
+def test_iter_report_rows(session):
+    student_repo = StudentRepository(session)
+    presence_repo = PresenceRepository(session)
+    marco = student_repo.create(Student(name="Marco"))
+    david = student_repo.create(Student(name="David"))
+    student_repo.create(Student(name="Fran"))
+    for student_id, day, start, end in [
+        (marco.id, 1, "09:02", "10:17"),
+        (marco.id, 3, "10:58", "12:05"),
+        (marco.id, 4, "10:00", "10:03"),
+        (david.id, 5, "14:02", "15:46"),
+    ]:
+        presence_repo.create(presence_factory(student_id=student_id, day=day, start_time=start, end_time=end, room="R1"))
+
+    rows = list(presence_repo.iter_report_rows(min_minutes=5, batch_size=1))
+
+    assert rows == [("Marco", 142, 2), ("David", 104, 1), ("Fran", 0, 0)]
+
+def test_iter_attended_days(session):
+    student_repo = StudentRepository(session)
+    presence_repo = PresenceRepository(session)
+    marco = student_repo.create(Student(name="Marco"))
+    student_repo.create(Student(name="Fran"))
+    for day, start, end in [(1, "09:00", "10:00"), (1, "11:00", "12:00"), (2, "09:00", "09:03")]:
+        presence_repo.create(presence_factory(student_id=marco.id, day=day, start_time=start, end_time=end, room="R1"))
+
+    assert list(presence_repo.iter_attended_days(min_minutes=5)) == [("Marco", 1), ("Fran", None)]
+
+def create_weeks(session):
+    student_repo = StudentRepository(session)
+    presence_repo = PresenceRepository(session)
+    marco = student_repo.create(Student(name="Marco"))
+    for day in (1, 2, 8, 15):
+        presence_repo.create(presence_factory(student_id=marco.id, day=day, start_time="09:00", end_time="10:00", room="R1"))
+    return presence_repo
+
+def test_iter_report_rows_day_range(session):
+    presence_repo = create_weeks(session)
+
+    assert list(presence_repo.iter_report_rows(min_minutes=5, first_day=2, last_day=8)) == [("Marco", 120, 2)]
+    assert list(presence_repo.iter_report_rows(min_minutes=5, first_day=9)) == [("Marco", 60, 1)]
+
+def test_archive_weeks(session, tmp_path):
+    presence_repo = create_weeks(session)
+    archive_path = str(tmp_path / "archive.db")
+
+    moved = presence_repo.archive_weeks(before_week=2, archive_path=archive_path)
+
+    assert moved == 3
+    assert [presence.day for presence in presence_repo.get_by_student(1)] == [15]
+    assert presence_repo.get_latest_archive().before_week == 2
+    archive_session = sessionmaker(bind=create_engine(f"sqlite:///{archive_path}"))()
+    archived = PresenceRepository(archive_session)
+    assert list(archived.iter_report_rows(min_minutes=5)) == [("Marco", 180, 3)]
+    archive_session.close()
+
+def test_archive_weeks_rejects_other_schema_version(session, tmp_path):
+    archive_path = str(tmp_path / "archive.db")
+    presence_repo = create_weeks(session)
+    presence_repo.archive_weeks(before_week=1, archive_path=archive_path)
+    archive_engine = create_engine(f"sqlite:///{archive_path}")
+    with archive_engine.begin() as connection:
+        connection.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+
+    with pytest.raises(ValueError, match="Archive schema version"):
+        presence_repo.archive_weeks(before_week=2, archive_path=archive_path)
+
+    with archive_engine.connect() as connection:
+        assert connection.exec_driver_sql("SELECT COUNT(*) FROM presences").scalar() == 2
+    archive_engine.dispose()
+
+def test_archive_weeks_after_ids_are_reused(session, tmp_path):
+    archive_path = str(tmp_path / "archive.db")
+    create_weeks(session).archive_weeks(before_week=2, archive_path=archive_path)
+    session.execute(text("DELETE FROM presences"))
+    session.execute(text("DELETE FROM students"))
+    session.commit()
+
+    student_repo = StudentRepository(session)
+    presence_repo = PresenceRepository(session)
+    fran = student_repo.create(Student(name="Fran"))
+    presence_repo.create(presence_factory(student_id=fran.id, day=3, start_time="09:00", end_time="09:30", room="R1"))
+    moved = presence_repo.archive_weeks(before_week=2, archive_path=archive_path)
+
+    assert moved == 1
+    archive_session = sessionmaker(bind=create_engine(f"sqlite:///{archive_path}"))()
+    archived = PresenceRepository(archive_session)
+    assert list(archived.iter_report_rows(min_minutes=5)) == [("Marco", 180, 3), ("Fran", 30, 1)]
+    archive_session.close()
+
+def test_iter_names(session):
+    student_repo = StudentRepository(session)
+    student_repo.create(Student(name="Marco"))
+    student_repo.create(Student(name="Fran"))
+
+    assert list(student_repo.iter_names(batch_size=1)) == [(1, "Marco"), (2, "Fran")]
+
+def test_iter_ordered_by_student(session):
+    presence_repo = PresenceRepository(session)
+    for student_id in (2, 1, 2):
+        presence_repo.create(presence_factory(**{**get_presence_mock(), "student_id": student_id}))
+
+    rows = list(presence_repo.iter_ordered_by_student(batch_size=1))
+
+    assert [row[0] for row in rows] == [1, 2, 2]
+    assert rows[0][1:] == (1, datetime.time(8, 0), datetime.time(9, 0))
+
+def test_create_duplicate_student_rolls_back(session):
+    student_repo = StudentRepository(session)
+    student_repo.create(Student(name="Marco"))
+
+    with pytest.raises(IntegrityError):
+        student_repo.create(Student(name="Marco"))
+
+    assert student_repo.create(Student(name="Fran")).id is not None
+
+def test_iter_all_presences(session):
+    presence_repo = PresenceRepository(session)
+    presence_repo.create(presence_factory(**get_presence_mock()))
+
+    assert list(presence_repo.iter_all(batch_size=1)) == [(1, 1, datetime.time(8, 0), datetime.time(9, 0), "test")]
@@ -1,7 +1,7 @@
 import pytest
 from marshmallow import ValidationError
 from datetime import time
-from app.schemas import StudentSchema, PresenceSchema
+from app.schemas import MAX_DAY, StudentSchema, PresenceSchema
 
 def test_student_schema_valid():
     schema = StudentSchema()
@@ -35,7 +35,7 @@ def test_presence_schema_invalid_day():
     schema = PresenceSchema()
     data = {
         "student_name": "John Doe",
-        "day": 8,
+        "day": 0,
         "start_time": time(9, 0),
         "end_time": time(10, 0),
         "room": "101"
@@ -44,10 +44,36 @@ def test_presence_schema_invalid_day():
         schema.load(data)
     assert "day" in excinfo.value.messages
 
+def test_presence_schema_later_week_day():
+    schema = PresenceSchema()
+    data = {
+        "student_id": 1,
+        "day": 10,
+        "start_time": "09:00",
+        "end_time": "10:00",
+        "room": "101"
+    }
+    result = schema.load(data)
+    assert result["day"] == 10
+
+def test_presence_schema_day_bounds():
+    schema = PresenceSchema()
+    data = {
+        "student_id": 1,
+        "day": MAX_DAY,
+        "start_time": "09:00",
+        "end_time": "10:00",
+        "room": "101"
+    }
+    assert schema.load(data)["day"] == MAX_DAY
+    with pytest.raises(ValidationError) as excinfo:
+        schema.load({**data, "day": 20241015})
+    assert "day" in excinfo.value.messages
+
 def test_presence_schema_invalid_time_order():
     schema = PresenceSchema()
     data = {
-        "student_name": "John Doe",
+        "student_id": 1,
         "day": 3,
         "start_time": time(10, 0),
         "end_time": time(9, 0),
@@ -55,4 +81,17 @@ def test_presence_schema_invalid_time_order():
     }
     with pytest.raises(ValidationError) as excinfo:
         schema.load(data)
-    assert "end_time" in excinfo.value.messages
\ No newline at end of file
+    assert "end_time" in excinfo.value.messages
+
+def test_presence_schema_accepts_parsed_times():
+    schema = PresenceSchema()
+    data = {
+        "student_id": 1,
+        "day": 3,
+        "start_time": time(9, 0),
+        "end_time": time(10, 0),
+        "room": "101"
+    }
+    result = schema.load(data)
+    assert result["start_time"] == time(9, 0)
+    assert result["end_time"] == time(10, 0)
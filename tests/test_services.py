@@ -1,8 +1,11 @@
 import pytest
 from unittest.mock import MagicMock
 from datetime import time
-from app.services import StudentService, PresenceService
-from app.models import Student, Presence
+from sqlalchemy.exc import IntegrityError
+from app.registry import StudentRegistry
+from app.timeseries import AttendanceTimeSeries
+from app.services import StudentService, PresenceService, DuplicateStudentError, ArchivedRangeError
+from app.models import Archive, Student, Presence
 
 @pytest.fixture
 def db_session():
@@ -22,6 +25,25 @@ def test_add_student(student_service):
     assert student.name == "John Doe"
     student_service.student_repo.create.assert_called_once()
 
+def test_add_student_duplicate_in_registry(student_service):
+    student_service.student_repo.iter_names = MagicMock(return_value=[(1, "John Doe")])
+    student_service.student_repo.create = MagicMock()
+    with pytest.raises(DuplicateStudentError, match="Student John Doe already exists"):
+        student_service.add_student("John Doe")
+    student_service.student_repo.create.assert_not_called()
+
+def test_add_student_duplicate_in_database(student_service):
+    student_service.student_repo.create = MagicMock(side_effect=IntegrityError("INSERT", {}, Exception()))
+    with pytest.raises(DuplicateStudentError):
+        student_service.add_student("John Doe")
+
+def test_add_student_registers_name(db_session):
+    registry = StudentRegistry()
+    student_service = StudentService(db_session, registry)
+    student_service.student_repo.create = MagicMock(return_value=Student(id=7, name="John Doe"))
+    student_service.add_student("John Doe")
+    assert registry.get_id("John Doe") == 7
+
 def test_get_all_students(student_service):
     student_service.student_repo.get_all = MagicMock(return_value=[Student(id=1, name="John Doe")])
     students = student_service.get_all_students()
@@ -39,19 +61,123 @@ def test_record_presence(presence_service):
     presence_service.student_repo.get_by_name.assert_called_once_with("John Doe")
     presence_service.presence_repo.create.assert_called_once()
 
+def test_record_presence_uses_registry(db_session):
+    registry = StudentRegistry()
+    registry.add("John Doe", 3)
+    presence_service = PresenceService(db_session, registry)
+    presence_service.student_repo.get_by_name = MagicMock()
+    presence_service.student_repo.iter_names = MagicMock(return_value=[])
+    presence_service.presence_repo.create = MagicMock(side_effect=lambda presence: presence)
+
+    presence = presence_service.record_presence("John Doe", 2, "09:00", "10:00", "101")
+
+    assert presence.student_id == 3
+    presence_service.student_repo.get_by_name.assert_not_called()
+
+def test_record_presence_registry_miss_falls_back_to_database(db_session):
+    registry = StudentRegistry()
+    presence_service = PresenceService(db_session, registry)
+    presence_service.student_repo.get_by_name = MagicMock(return_value=Student(id=4, name="John Doe"))
+    presence_service.student_repo.iter_names = MagicMock(return_value=[])
+    presence_service.presence_repo.create = MagicMock(side_effect=lambda presence: presence)
+
+    presence = presence_service.record_presence("John Doe", 1, time(9, 0), time(10, 0), "101")
+
+    assert presence.student_id == 4
+    assert registry.get_id("John Doe") == 4
+
 def test_record_presence_student_not_exist(presence_service):
     presence_service.student_repo.get_by_name = MagicMock(return_value=None)
     with pytest.raises(ValueError, match="Student John Doe does not exist"):
         presence_service.record_presence("John Doe", 1, time(9, 0), time(10, 0), "101")
 
 def test_generate_report(presence_service):
-    presence_service.student_repo.get_all = MagicMock(return_value=[Student(id=1, name="John Doe")])
-    presence_service.presence_repo.get_by_student = MagicMock(return_value=[
-        Presence(id=1, student_id=1, day=1, start_time=time(9, 0), end_time=time(10, 0), room="101"),
-        Presence(id=2, student_id=1, day=2, start_time=time(9, 0), end_time=time(10, 0), room="101")
-    ])
+    presence_service.student_repo.iter_names = MagicMock(return_value=iter([(1, "John Doe"), (2, "Jane Doe")]))
+    presence_service.presence_repo.iter_ordered_by_student = MagicMock(return_value=iter([
+        (1, 1, time(9, 0), time(10, 0)),
+        (1, 2, time(9, 0), time(10, 0)),
+        (2, 1, time(9, 0), time(9, 3)),
+        (2, 3, time(9, 0), time(9, 30)),
+    ]))
     report = presence_service.generate_report()
-    assert len(report) == 1
-    assert report[0] == "John Doe: 120 minutes in 2 days"
-    presence_service.student_repo.get_all.assert_called_once()
-    presence_service.presence_repo.get_by_student.assert_called_once_with(1)
+    assert report == ["John Doe: 120 minutes in 2 days", "Jane Doe: 30 minutes in 1 day"]
+    presence_service.student_repo.iter_names.assert_called_once()
+    presence_service.presence_repo.iter_ordered_by_student.assert_called_once()
+
+def test_generate_report_skips_orphan_presences(presence_service):
+    presence_service.student_repo.iter_names = MagicMock(return_value=iter([(2, "John Doe"), (3, "Jane Doe")]))
+    presence_service.presence_repo.iter_ordered_by_student = MagicMock(return_value=iter([
+        (1, 1, time(9, 0), time(10, 0)),
+        (2, 2, time(9, 0), time(10, 0)),
+    ]))
+    report = presence_service.generate_report()
+    assert report == ["John Doe: 60 minutes in 1 day", "Jane Doe: 0 minutes"]
+
+def test_iter_report(presence_service):
+    presence_service.presence_repo.iter_report_rows = MagicMock(return_value=iter([("John Doe", 120, 2)]))
+    report = list(presence_service.iter_report(batch_size=10))
+    assert report == [("John Doe", 120, 2)]
+    presence_service.presence_repo.iter_report_rows.assert_called_once_with(5, 10, None, None)
+
+def test_generate_weekly_report(presence_service):
+    presence_service.presence_repo.iter_attended_days = MagicMock(return_value=iter([
+        ("John Doe", 1), ("John Doe", 2), ("John Doe", 3), ("John Doe", 4), ("John Doe", 5), ("John Doe", 8),
+        ("Jane Doe", 1), ("Jane Doe", 8),
+    ]))
+    report = presence_service.generate_weekly_report()
+    assert report[0] == "Monday: 2 students"
+    assert report[1] == "Tuesday: 1 student"
+    assert report[6] == "Sunday: 0 students"
+    assert report[7] == "Every day: none"
+    presence_service.presence_repo.iter_attended_days.assert_called_once_with(5)
+
+def test_record_presence_updates_timeseries(db_session):
+    timeseries = AttendanceTimeSeries(bucket_minutes=60)
+    presence_service = PresenceService(db_session, timeseries=timeseries)
+    presence_service.registry.add("John Doe", 1)
+    presence_service.student_repo.iter_names = MagicMock(return_value=[])
+    presence_service.presence_repo.create = MagicMock(side_effect=lambda presence: presence)
+
+    presence_service.record_presence("John Doe", 1, "09:00", "10:00", "101")
+    presence_service.record_presence("John Doe", 1, "11:00", "11:03", "101")
+
+    assert timeseries.room_series("101", 1, 1)[9:12] == [1, 0, 0]
+    assert timeseries.student_total(1, last_day=1, days=1) == 60
+
+def test_load_timeseries(presence_service):
+    presence_service.presence_repo.iter_all = MagicMock(return_value=iter([
+        (1, 1, time(9, 0), time(10, 0), "101"),
+        (1, 2, time(9, 0), time(9, 2), "101"),
+    ]))
+    timeseries = presence_service.load_timeseries()
+    assert presence_service.timeseries is timeseries
+    assert timeseries.student_total(1, last_day=2, days=2) == 60
+
+def test_iter_report_rejects_archived_range(presence_service):
+    presence_service.presence_repo.get_latest_archive = MagicMock(return_value=Archive(path="old.db", before_week=2))
+    presence_service.presence_repo.iter_report_rows = MagicMock(return_value=iter([]))
+
+    with pytest.raises(ArchivedRangeError, match="Weeks before 2 are archived in old.db"):
+        presence_service.iter_report(first_day=10)
+    with pytest.raises(ArchivedRangeError):
+        presence_service.iter_report(last_day=20)
+
+    assert list(presence_service.iter_report(first_day=15)) == []
+    assert list(presence_service.iter_report()) == []
+
+@pytest.mark.parametrize("first_day, last_day", [(None, None), (2, 9), (8, None)])
+def test_report_paths_agree(session, first_day, last_day):
+    registry = StudentRegistry()
+    student_service = StudentService(session, registry)
+    presence_service = PresenceService(session, registry)
+    for index in range(30):
+        student_service.add_student(f"S{index}")
+    for index in range(0, 30, 3):
+        for day in range(1, index % 12 + 2):
+            presence_service.record_presence(f"S{index}", day, "09:00", f"{9 + day % 3}:{index % 7 * 2 + 1:02}", "R100")
+
+    sql_report = list(presence_service.iter_report(first_day=first_day, last_day=last_day))
+    merge_report = list(presence_service.iter_report(first_day=first_day, last_day=last_day, low_memory=True))
+
+    assert len(sql_report) == 30
+    assert merge_report == sql_report
@@ -0,0 +1,96 @@
+import gc
+import threading
+import time
+from sqlalchemy import text
+from app.models import Student
+from app.repositories import StudentRepository
+from app.services import PresenceService
+from app.snapshot import DatabaseSnapshot
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+def test_snapshot_is_isolated_from_later_writes(engine, session):
+    StudentRepository(session).create(Student(name="Marco"))
+    snapshot = DatabaseSnapshot(engine)
+    snapshot_session = snapshot.session()
+
+    StudentRepository(session).create(Student(name="Fran"))
+
+    assert PresenceService(snapshot_session).generate_report() == ["Marco: 0 minutes"]
+    snapshot.refresh()
+    assert len(PresenceService(snapshot.session()).generate_report()) == 2
+    assert PresenceService(snapshot_session).generate_report() == ["Marco: 0 minutes"]
+    snapshot_session.close()
+
+def test_snapshot_keeps_copy_of_unused_session(engine, session):
+    StudentRepository(session).create(Student(name="Marco"))
+    snapshot = DatabaseSnapshot(engine)
+    snapshot_session = snapshot.session()
+    gc.collect()
+
+    snapshot.refresh()
+    gc.collect()
+
+    assert PresenceService(snapshot_session).generate_report() == ["Marco: 0 minutes"]
+    snapshot_session.close()
+
+def test_snapshot_staleness(engine, session):
+    clock = FakeClock()
+    snapshot = DatabaseSnapshot(engine, max_age=30, clock=clock)
+    assert snapshot.staleness is None
+
+    snapshot.session().close()
+    StudentRepository(session).create(Student(name="Marco"))
+    clock.now += 20
+
+    assert snapshot.staleness == 20
+    assert PresenceService(snapshot.session()).generate_report() == []
+
+    clock.now += 20
+    assert PresenceService(snapshot.session()).generate_report() == ["Marco: 0 minutes"]
+    assert snapshot.staleness == 0
+
+def test_snapshot_background_refresh(engine, session):
+    snapshot = DatabaseSnapshot(engine, max_age=3600)
+    snapshot.start(interval=0.01)
+    try:
+        StudentRepository(session).create(Student(name="Marco"))
+        first = snapshot.taken_at
+        deadline = time.monotonic() + 5
+        while snapshot.taken_at == first:
+            assert time.monotonic() < deadline, "the snapshot was not refreshed"
+            time.sleep(0.005)
+    finally:
+        snapshot.stop()
+
+    assert len(StudentRepository(snapshot.session()).get_all()) == 1
+
+def test_snapshot_switches_source_to_wal(engine):
+    DatabaseSnapshot(engine)
+
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+
+def test_snapshot_sessions_in_other_threads(engine, session):
+    StudentRepository(session).create(Student(name="Marco"))
+    snapshot = DatabaseSnapshot(engine)
+    snapshot.refresh()
+    reports = []
+
+    def report():
+        snapshot_session = snapshot.session()
+        reports.append(PresenceService(snapshot_session).generate_report())
+        snapshot_session.close()
+
+    threads = [threading.Thread(target=report) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert reports == [["Marco: 0 minutes"]] * 4
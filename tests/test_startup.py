@@ -0,0 +1,98 @@
+import os
+import subprocess
+import sys
+from unittest.mock import patch
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect
+from app import init_db, SCHEMA_VERSION
+from app.db import Base
+
+# Cumulative -X importtime budgets (microseconds) for importing the CLI module,
+# which argument errors stop at, and for every import of a run on a small input.
+IMPORT_BUDGET_US = 100_000
+RUN_IMPORT_BUDGET_US = 500_000
+HEAVY_MODULES = ("sqlalchemy", "marshmallow")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def import_times(*args, cwd=ROOT):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True, text=True, check=True, cwd=cwd,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), name.rstrip()))
+    return rows
+
+def test_cli_import_does_not_load_heavy_modules():
+    rows = import_times("-c", "import main")
+    loaded = {name.strip() for _, name in rows}
+    assert not any(module.split(".")[0] in HEAVY_MODULES for module in loaded)
+
+def test_cli_import_within_budget():
+    rows = import_times("-c", "import main")
+    total = sum(cumulative for cumulative, name in rows if name == "main")
+    assert total < IMPORT_BUDGET_US
+
+def test_cli_run_imports_within_budget(tmp_path):
+    input_file = tmp_path / "input.txt"
+    input_file.write_text("Student Marco\nPresence Marco 1 09:02 10:17 R100\n")
+
+    # The run creates its database in the working directory.
+    rows = import_times(os.path.join(ROOT, "main.py"), str(input_file), cwd=tmp_path)
+    total = sum(cumulative for cumulative, name in rows if not name.startswith("  "))
+    assert {"sqlalchemy", "marshmallow", "app.services"} <= {name.strip() for _, name in rows}
+    assert total < RUN_IMPORT_BUDGET_US
+
+def test_init_db_creates_schema_and_sets_version():
+    engine = create_engine('sqlite:///:memory:')
+    init_db(engine)
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("PRAGMA user_version").scalar() == SCHEMA_VERSION
+    assert {"students", "presences"} <= set(inspect(engine).get_table_names())
+
+def test_init_db_skips_create_all_when_version_matches():
+    engine = create_engine('sqlite:///:memory:')
+    init_db(engine)
+    with patch.object(Base.metadata, "create_all") as create_all:
+        init_db(engine)
+    create_all.assert_not_called()
+
+def test_init_db_refuses_other_version():
+    engine = create_engine('sqlite:///:memory:')
+    with engine.begin() as connection:
+        connection.exec_driver_sql("CREATE TABLE students (id INTEGER PRIMARY KEY, name VARCHAR)")
+        connection.exec_driver_sql("INSERT INTO students (name) VALUES ('Marco')")
+        connection.exec_driver_sql("PRAGMA user_version = 3")
+
+    with pytest.raises(ValueError, match="schema version 3"):
+        init_db(engine)
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("SELECT name FROM students").scalars().all() == ["Marco"]
+
+def test_init_db_refuses_unversioned_tables():
+    engine = create_engine('sqlite:///:memory:')
+    with engine.begin() as connection:
+        connection.exec_driver_sql("CREATE TABLE students (id INTEGER PRIMARY KEY, name VARCHAR)")
+
+    with pytest.raises(ValueError, match="schema version 0"):
+        init_db(engine)
+
+def test_alembic_head_matches_schema_version(tmp_path):
+    url = f"sqlite:///{tmp_path / 'attendance.db'}"
+    config = Config()
+    config.set_main_option("script_location", os.path.join(ROOT, "app", "migrations"))
+    config.set_main_option("sqlalchemy.url", url)
+    command.upgrade(config, "head")
+
+    engine = create_engine(url)
+    with patch.object(Base.metadata, "create_all") as create_all:
+        init_db(engine)
+    create_all.assert_not_called()
+    assert {"students", "presences", "archives"} <= set(inspect(engine).get_table_names())
+    engine.dispose()
@@ -0,0 +1,82 @@
+import io
+from datetime import time
+import pytest
+from app.timeseries import AttendanceTimeSeries
+
+@pytest.fixture
+def series():
+    series = AttendanceTimeSeries(bucket_minutes=30)
+    series.add(1, 1, time(9, 0), time(10, 0), "R100")
+    series.add(2, 1, time(9, 40), time(10, 10), "R100")
+    series.add(1, 2, time(9, 0), time(9, 30), "F505")
+    series.add(1, 3, time(14, 0), time(15, 0), "R100")
+    return series
+
+def test_invalid_bucket_width():
+    with pytest.raises(ValueError):
+        AttendanceTimeSeries(bucket_minutes=7)
+
+def test_room_series(series):
+    day_one = series.room_series("R100", 1, 1)
+
+    assert len(day_one) == 48
+    assert day_one[18:21] == [1, 2, 1]
+    assert sum(day_one) == 4
+    assert series.room_series("R100", 2, 2) == [0] * 48
+    assert series.room_series("Unknown", 1, 1) == [0] * 48
+
+def test_moving_average(series):
+    averages = series.moving_average("R100", 1, 1, window=2)
+
+    assert len(averages) == 47
+    assert averages[17:21] == [0.5, 1.5, 1.5, 0.5]
+
+def test_rolling_student_totals(series):
+    assert series.student_total(1, last_day=3, days=2) == 90
+    assert series.student_total(1, last_day=3, days=7) == 150
+    assert series.rolling_student_totals(last_day=1, days=1) == {1: 60, 2: 30}
+
+def test_rebuild(series):
+    series.rebuild([(3, 1, time(8, 0), time(8, 20), "R1")])
+
+    assert list(series.rooms) == ["R1"]
+    assert series.students == {3: series.students[3]}
+    assert series.student_total(3, last_day=1, days=1) == 20
+
+def test_write_csv(series):
+    stream = io.StringIO()
+    series.write_csv(stream)
+
+    assert stream.getvalue().splitlines()[:4] == [
+        "room,day,start,count", "F505,2,09:00,1", "R100,1,09:00,1", "R100,1,09:30,2",
+    ]
+
+def test_write_student_csv(series):
+    stream = io.StringIO()
+    series.write_student_csv(stream)
+
+    assert stream.getvalue().splitlines() == [
+        "student_id,day,minutes", "1,1,60", "1,2,30", "1,3,60", "2,1,30",
+    ]
+
+def test_binary_round_trip(series):
+    stream = io.BytesIO()
+    series.write_binary(stream)
+    stream.seek(0)
+
+    loaded = AttendanceTimeSeries.read_binary(stream)
+
+    assert loaded.bucket_minutes == 30
+    assert loaded.rooms == series.rooms
+
+def test_read_binary_rejects_other_data():
+    with pytest.raises(ValueError):
+        AttendanceTimeSeries.read_binary(io.BytesIO(b"nope"))
+
+def test_far_day_only_allocates_that_day():
+    series = AttendanceTimeSeries(bucket_minutes=30)
+    series.add(1, 1_000_000, time(9, 0), time(10, 0), "R100")
+
+    assert list(series.rooms["R100"]) == [1_000_000]
+    assert series.room_series("R100", 1_000_000, 1_000_000)[18:20] == [1, 1]
+    assert series.student_total(1, last_day=1_000_000, days=7) == 60